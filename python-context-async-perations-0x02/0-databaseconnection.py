@@ -4,16 +4,25 @@ class DatabaseConnection:
     """
     A class-based context manager for handling database connections.
     Automatically opens and closes database connections using the with statement.
+    
+    The tuning PRAGMAs to apply on connect come from the caller, e.g. one of
+    the named profiles in python-decorators-0x01/db_pool.py (PROFILES). Note
+    that journal_mode=WAL (as in the 'performance' profile) persistently
+    switches the database file to WAL mode: it stays in WAL after the
+    connection closes, and other tools opening it will see its -wal and
+    -shm sidecar files.
     """
     
-    def __init__(self, database_path):
+    def __init__(self, database_path, pragmas=None):
         """
         Initialize the context manager with the database path.
         
         Args:
             database_path (str): Path to the SQLite database file
+            pragmas (dict): {pragma: value} applied on connect; None keeps SQLite's defaults
         """
         self.database_path = database_path
+        self.pragmas = pragmas or {}
         self.connection = None
         self.cursor = None
     
@@ -26,11 +35,17 @@ class DatabaseConnection:
         """
         try:
             self.connection = sqlite3.connect(self.database_path)
+            for pragma, value in self.pragmas.items():
+                # journal_mode answers with a row, which must be read before moving on
+                self.connection.execute(f"PRAGMA {pragma} = {value}").fetchall()
             self.cursor = self.connection.cursor()
             print(f"Database connection opened: {self.database_path}")
             return self.connection
         except sqlite3.Error as e:
             print(f"Error opening database connection: {e}")
+            if self.connection:
+                self.connection.close()
+                self.connection = None
             raise
     
     def __exit__(self, exc_type, exc_value, traceback):
@@ -1,13 +1,375 @@
 import sqlite3
 import functools
+import atexit
+import json
+import logging
+import logging.handlers
+import math
+import queue
+import random
+import re
+import threading
+import time
+from collections import deque
 
-#### decorator to log SQL queries
+# Query log records go through a queue; a listener thread redacts and
+# renders them (see _QueryListener) and does the actual I/O
+query_logger = logging.getLogger('sql.queries')
+query_logger.setLevel(logging.INFO)
+query_logger.propagate = False
 
-def log_queries(func):
+_log_queue = queue.SimpleQueue()
+_listener = None
+
+# Quoted string literals in the SQL text, masked when redacting
+STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+REDACTED = '<redacted>'
+
+# Literals replaced by ? when fingerprinting, and lists of them collapsed
+NUMERIC_LITERAL = re.compile(r"\b-?\d+(?:\.\d+)?(?:[eE][-+]?\d+)?\b")
+PLACEHOLDER_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)*\s*\)")
+WHITESPACE = re.compile(r"\s+")
+
+
+def configure_query_logging(*handlers):
+    """
+    Start the background listener that writes query log records.
+    Calling it again replaces the handlers of the previous listener.
+    
+    Args:
+        *handlers (logging.Handler): Where records end up; defaults to stderr
+    """
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+    if not handlers:
+        handler = logging.StreamHandler()
+        handler.setFormatter(logging.Formatter('%(asctime)s %(levelname)s %(message)s'))
+        handlers = (handler,)
+    
+    if not query_logger.handlers:
+        query_logger.addHandler(_QueryQueueHandler(_log_queue))
+    _listener = _QueryListener(_log_queue, *handlers, respect_handler_level=True)
+    _listener.start()
+
+
+class _QueryQueueHandler(logging.handlers.QueueHandler):
+    """
+    QueueHandler that enqueues records as they are. The stock one formats
+    every record on the caller's thread; the listener is in-process, so the
+    raw query and parameters can travel with the record instead.
+    """
+    
+    def prepare(self, record):
+        return record
+
+
+class _QueryListener(logging.handlers.QueueListener):
+    """
+    QueueListener that renders query log records (see render_query_fields)
+    before handing them to its handlers, off the caller's thread.
+    """
+    
+    def prepare(self, record):
+        raw = getattr(record, 'sql_raw', None)
+        if raw is not None:
+            record.sql = render_query_fields(*raw)
+            record.args = (record.sql,)
+            del record.sql_raw
+        return record
+
+
+def stop_query_logging():
+    """
+    Flush pending query log records and stop the listener thread.
     """
-    Decorator that logs SQL queries before executing them.
-    Assumes the first argument to the decorated function is the SQL query.
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+atexit.register(stop_query_logging)
+
+
+def redact_query(query, params):
+    """
+    Mask string literals in the SQL text and every bound parameter value.
+    
+    Args:
+        query (str): The SQL query
+        params: Bound parameters (sequence or mapping), or None
+    
+    Returns:
+        tuple: (redacted query, redacted params)
+    """
+    query = STRING_LITERAL.sub(f"'{REDACTED}'", query)
+    if isinstance(params, dict):
+        params = {name: REDACTED for name in params}
+    elif isinstance(params, (list, tuple)):
+        params = [REDACTED] * len(params)
+    elif params is not None:
+        params = REDACTED
+    return query, params
+
+
+@functools.lru_cache(maxsize=4096)
+def fingerprint_query(query):
+    """
+    Normalise a query so calls differing only in literal values share a key:
+    string and numeric literals become ?, lists of them (e.g. IN (1, 2, 3))
+    become (?), whitespace is collapsed and keywords are lowercased.
+    
+    Args:
+        query (str): The SQL query
+    
+    Returns:
+        str: The fingerprint
+    """
+    query = STRING_LITERAL.sub('?', query)
+    query = NUMERIC_LITERAL.sub('?', query)
+    query = PLACEHOLDER_LIST.sub('(?)', query)
+    return WHITESPACE.sub(' ', query).strip().lower()
+
+
+def render_query_fields(function, query, params, duration_ms, slow, error, redact):
+    """
+    Structured fields of one query log record, redacted if asked to.
+    
+    Returns:
+        dict: function, query, params, duration_ms, slow and error
+    """
+    if redact and isinstance(query, str):
+        query, params = redact_query(query, params)
+    return {
+        'function': function,
+        'query': query,
+        'params': params,
+        'duration_ms': round(duration_ms, 3),
+        'slow': slow,
+        'error': None if error is None else repr(error),
+    }
+
+
+def count_rows(result):
     """
+    Rows returned by a query function: the length of a fetchall() list,
+    1 for a fetchone() row and 0 for None.
+    """
+    if result is None:
+        return 0
+    if isinstance(result, list):
+        return len(result)
+    return 1
+
+
+class QueryStats:
+    """
+    In-process aggregate statistics per query fingerprint, in the spirit of
+    pg_stat_statements.
+    
+    The table holds at most max_fingerprints entries; when a new fingerprint
+    arrives at a full table the least-called of eviction_sample randomly
+    chosen entries is dropped (an approximate LFU, as in Redis), so eviction
+    stays O(1) under the lock. p95 is computed over the latest window
+    durations of each fingerprint. Thread-safe.
+    """
+    
+    def __init__(self, max_fingerprints=1000, window=512, eviction_sample=8):
+        self.max_fingerprints = max_fingerprints
+        self.window = window
+        self.eviction_sample = eviction_sample
+        self.evicted = 0
+        self._entries = {}
+        # Fingerprints in arbitrary order for sampling; each entry's 'slot' indexes it
+        self._keys = []
+        self._lock = threading.Lock()
+        self._flush_stop = None
+        self._flush_thread = None
+    
+    def record(self, query, duration_ms, rows, error=False):
+        """
+        Add one call to the aggregates of its fingerprint.
+        
+        Args:
+            query (str): The SQL query as executed
+            duration_ms (float): How long the call took
+            rows (int): Rows returned
+            error (bool): Whether the call raised
+        """
+        fingerprint = fingerprint_query(query)
+        with self._lock:
+            entry = self._entries.get(fingerprint)
+            if entry is None:
+                if len(self._entries) >= self.max_fingerprints:
+                    self._evict()
+                entry = self._entries[fingerprint] = {
+                    'calls': 0, 'errors': 0, 'rows': 0, 'total_ms': 0.0,
+                    'min_ms': duration_ms, 'max_ms': duration_ms,
+                    'recent_ms': deque(maxlen=self.window), 'slot': len(self._keys),
+                }
+                self._keys.append(fingerprint)
+            entry['calls'] += 1
+            entry['errors'] += bool(error)
+            entry['rows'] += rows
+            entry['total_ms'] += duration_ms
+            entry['min_ms'] = min(entry['min_ms'], duration_ms)
+            entry['max_ms'] = max(entry['max_ms'], duration_ms)
+            entry['recent_ms'].append(duration_ms)
+    
+    def _evict(self):
+        """
+        Drop the least-called of a random sample of entries (called with the lock held).
+        """
+        keys = self._keys
+        sample = (keys[random.randrange(len(keys))] for _ in range(self.eviction_sample))
+        victim = min(sample, key=lambda key: self._entries[key]['calls'])
+        
+        # Swap the last key into the victim's slot so removal is O(1)
+        slot = self._entries.pop(victim)['slot']
+        last = keys.pop()
+        if last != victim:
+            keys[slot] = last
+            self._entries[last]['slot'] = slot
+        self.evicted += 1
+    
+    def snapshot(self, reset=False):
+        """
+        Current aggregates, most total time first.
+        
+        Args:
+            reset (bool): Clear the table after reading it
+        
+        Returns:
+            list: One dict per fingerprint with fingerprint, calls, errors, rows,
+            total_ms, mean_ms, min_ms, max_ms and p95_ms
+        """
+        with self._lock:
+            entries = self._entries
+            if reset:
+                self._entries = {}
+                self._keys = []
+            else:
+                entries = {key: dict(entry, recent_ms=list(entry['recent_ms']))
+                           for key, entry in entries.items()}
+        
+        result = []
+        for fingerprint, entry in entries.items():
+            recent = sorted(entry['recent_ms'])
+            p95 = recent[max(1, math.ceil(0.95 * len(recent))) - 1] if recent else 0.0
+            result.append({
+                'fingerprint': fingerprint,
+                'calls': entry['calls'],
+                'errors': entry['errors'],
+                'rows': entry['rows'],
+                'total_ms': entry['total_ms'],
+                'mean_ms': entry['total_ms'] / entry['calls'],
+                'min_ms': entry['min_ms'],
+                'max_ms': entry['max_ms'],
+                'p95_ms': p95,
+            })
+        result.sort(key=lambda item: item['total_ms'], reverse=True)
+        return result
+    
+    def reset(self):
+        """
+        Drop all aggregates.
+        """
+        with self._lock:
+            self._entries = {}
+            self._keys = []
+            self.evicted = 0
+    
+    def dump(self, path, reset=False):
+        """
+        Write a snapshot to a JSON file.
+        
+        Args:
+            path (str): Output file
+            reset (bool): Clear the table after reading it
+        """
+        with open(path, 'w', encoding='utf-8') as file:
+            json.dump({'timestamp': time.time(), 'evicted': self.evicted,
+                       'queries': self.snapshot(reset)}, file, indent=2)
+    
+    def start_flush(self, interval=60.0, sink=None, reset=True):
+        """
+        Hand a snapshot to sink every interval seconds on a daemon thread.
+        
+        Args:
+            interval (float): Seconds between flushes
+            sink (callable): Called with each snapshot; defaults to logging
+                every fingerprint to the sql.queries logger
+            reset (bool): Start each interval from an empty table
+        """
+        self.stop_flush()
+        sink = sink or _log_snapshot
+        stop = threading.Event()
+        
+        def run():
+            while not stop.wait(interval):
+                sink(self.snapshot(reset))
+        
+        self._flush_stop = stop
+        self._flush_thread = threading.Thread(target=run, name='query-stats-flush', daemon=True)
+        self._flush_thread.start()
+    
+    def stop_flush(self):
+        """
+        Stop the periodic flush started by start_flush.
+        """
+        if self._flush_thread is not None:
+            self._flush_stop.set()
+            self._flush_thread.join()
+            self._flush_thread = None
+            self._flush_stop = None
+
+
+def _log_snapshot(snapshot):
+    if _listener is None:
+        configure_query_logging()
+    for entry in snapshot:
+        query_logger.info("[SQL QUERY STATS] %s", entry, extra={'sql_stats': entry})
+
+
+# Aggregates shared by every @log_queries function unless one passes its own
+query_stats = QueryStats()
+
+
+def log_queries(func=None, *, slow_ms=100.0, sample_rate=0.01, redact=True, logger=None,
+                stats=query_stats):
+    """
+    Decorator that logs SQL queries with how long they took.
+    Assumes the first argument to the decorated function is the SQL query,
+    optionally followed by its parameters (or a params keyword argument).
+    
+    Queries slower than slow_ms (and failed ones) are always logged, at
+    WARNING (ERROR). Other queries are logged at INFO for a random
+    sample_rate fraction of calls, 1% by default, so an unsampled call only
+    costs a clock read, a random number and a stats update. Records carry
+    the raw query and parameters through a queue to a listener thread (see
+    configure_query_logging), which redacts, formats and writes them, so
+    the caller never blocks on I/O or formatting. With a custom logger the
+    record is rendered on the caller's thread instead.
+    
+    Every call, sampled or not, is also added to stats under its fingerprint
+    (see fingerprint_query and QueryStats).
+    
+    Can be used bare (@log_queries) or with options (@log_queries(slow_ms=50)).
+    
+    Args:
+        slow_ms (float): Threshold in milliseconds for the slow-query log
+        sample_rate (float): Fraction (0.0-1.0) of other queries to log; 1.0 logs every call
+        redact (bool): Mask string literals and parameter values in the log
+        logger (logging.Logger): Logger to use instead of sql.queries
+        stats (QueryStats): Aggregate table to record into; None disables aggregation
+    """
+    if func is None:
+        return functools.partial(log_queries, slow_ms=slow_ms, sample_rate=sample_rate,
+                                 redact=redact, logger=logger, stats=stats)
+    if not 0.0 <= sample_rate <= 1.0:
+        raise ValueError("sample_rate must be between 0.0 and 1.0")
+    
     @functools.wraps(func)
     def wrapper(*args, **kwargs):
         # Extract the query from function arguments
@@ -16,17 +378,53 @@ def log_queries(func):
         elif 'query' in kwargs:
             query = kwargs['query']
         else:
-            query = "No query found"
+            query = None
         
-        # Log the query
-        print(f"[SQL QUERY LOG] Executing: {query}")
-        
-        # Execute the original function
-        return func(*args, **kwargs)
+        # Time the original function
+        start = time.perf_counter()
+        error = None
+        result = None
+        try:
+            result = func(*args, **kwargs)
+            return result
+        except Exception as e:
+            error = e
+            raise
+        finally:
+            duration_ms = (time.perf_counter() - start) * 1000
+            # Calls without a query are logged but not aggregated
+            if stats is not None and isinstance(query, str):
+                stats.record(query, duration_ms, count_rows(result), error is not None)
+            slow = duration_ms >= slow_ms
+            if slow or error is not None or random.random() < sample_rate:
+                params = args[1] if len(args) > 1 else kwargs.get('params')
+                _log_query(logger or query_logger, func.__name__,
+                           "No query found" if query is None else query, params,
+                           duration_ms, slow, error, redact)
     
     return wrapper
 
-@log_queries
+
+def _log_query(logger, function, query, params, duration_ms, slow, error, redact):
+    if error is not None:
+        level = logging.ERROR
+    elif slow:
+        level = logging.WARNING
+    else:
+        level = logging.INFO
+    
+    raw = (function, query, params, duration_ms, slow, error, redact)
+    if logger is query_logger:
+        if _listener is None:
+            configure_query_logging()
+        # Rendered by _QueryListener on its own thread
+        logger.log(level, "[SQL QUERY LOG] %s", None, extra={'sql_raw': raw})
+    else:
+        fields = render_query_fields(*raw)
+        logger.log(level, "[SQL QUERY LOG] %s", fields, extra={'sql': fields})
+
+
+@log_queries(sample_rate=1.0)
 def fetch_all_users(query):
     conn = sqlite3.connect('users.db')
     cursor = conn.cursor()
@@ -36,4 +434,6 @@ def fetch_all_users(query):
     return results
 
 #### fetch users while logging the query
-users = fetch_all_users(query="SELECT * FROM users")
\ No newline at end of file
+# (only when run as a script, so the module can be imported by its tests)
+if __name__ == "__main__":
+    users = fetch_all_users(query="SELECT * FROM users")
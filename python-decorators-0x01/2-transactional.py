@@ -1,32 +1,14 @@
-import sqlite3
 import functools
-
-def with_db_connection(func):
-    """
-    Decorator that automatically handles database connection opening and closing.
-    Creates a connection, passes it as the first argument to the decorated function,
-    and ensures the connection is closed afterward.
-    """
-    @functools.wraps(func)
-    def wrapper(*args, **kwargs):
-        # Open database connection
-        conn = sqlite3.connect('users.db')
-        
-        try:
-            # Call the original function with connection as first argument
-            result = func(conn, *args, **kwargs)
-            return result
-        finally:
-            # Always close the connection, even if an exception occurs
-            conn.close()
-    
-    return wrapper
+from db_pool import tables_written, with_db_connection
 
 def transactional(func):
     """
     Decorator that wraps a function in a database transaction.
     If the function completes successfully, commits the transaction.
     If an exception occurs, rolls back the transaction.
+    
+    Committing a pooled connection tells cache_query which tables were
+    written; for any other connection every cached result is invalidated.
     """
     @functools.wraps(func)
     def wrapper(conn, *args, **kwargs):
@@ -37,6 +19,9 @@ def transactional(func):
             
             # If no exception occurred, commit the transaction
             conn.commit()
+            if not hasattr(conn, 'written_tables'):
+                # Not a pooled connection: the written tables are unknown
+                tables_written(None)
             return result
             
         except Exception as e:
@@ -1,27 +1,6 @@
 import time
-import sqlite3
 import functools
-
-def with_db_connection(func):
-    """
-    Decorator that automatically handles database connection opening and closing.
-    Creates a connection, passes it as the first argument to the decorated function,
-    and ensures the connection is closed afterward.
-    """
-    @functools.wraps(func)
-    def wrapper(*args, **kwargs):
-        # Open database connection
-        conn = sqlite3.connect('users.db')
-        
-        try:
-            # Call the original function with connection as first argument
-            result = func(conn, *args, **kwargs)
-            return result
-        finally:
-            # Always close the connection, even if an exception occurs
-            conn.close()
-    
-    return wrapper
+from db_pool import with_db_connection
 
 def retry_on_failure(retries=3, delay=2):
     """
@@ -1,15 +1,333 @@
+import sys
 import time
-import sqlite3 
 import functools
+import heapq
+import itertools
+import threading
+import weakref
+from collections import OrderedDict
+from db_pool import on_tables_written, tables_in_query, with_db_connection
 
+EVICTION_POLICIES = ('lru', 'lfu')
 
-query_cache = {}
 
-def cache_query(func):
+def estimate_size(value):
     """
-    Decorator that caches query results based on the SQL query string.
-    Uses the query parameter as the cache key.
+    Approximate memory held by a query result: the containers plus every
+    row and value in them (rows from fetchall() or a single fetchone() row).
     """
+    size = sys.getsizeof(value)
+    if isinstance(value, (list, tuple)):
+        for item in value:
+            size += sys.getsizeof(item)
+            if isinstance(item, (list, tuple)):
+                size += sum(sys.getsizeof(field) for field in item)
+    return size
+
+
+class QueryCache:
+    """
+    Thread-safe cache of query results bounded by entry count and/or bytes.
+    
+    When a bound is exceeded, expired entries are dropped first; after that
+    the least recently used entry ('lru') or the least often used entry
+    ('lfu', oldest first on ties) is evicted. Under 'lfu' entries are kept in
+    buckets by use count, so picking a victim is O(1). Entries older than
+    ttl seconds are treated as missing and dropped on access.
+    
+    Each entry is tagged with the tables its query reads, so invalidate()
+    can drop just the results a write made stale. Entries whose tables are
+    unknown are dropped by every invalidation.
+    
+    Every invalidation bumps a generation counter. A caller reads
+    generation() before running its query and passes it to put(), which
+    drops the result if a matching invalidation happened in between, as the
+    query may have read the data from before the write.
+    """
+
+    def __init__(self, max_entries=1024, max_bytes=None, ttl=None, policy='lru'):
+        """
+        Initialize the cache.
+        
+        Args:
+            max_entries (int): Maximum number of cached results, or None for no limit
+            max_bytes (int): Maximum estimated size of all results, or None for no limit
+            ttl (float): Seconds an entry stays valid, or None to never expire
+            policy (str): 'lru' or 'lfu'
+        """
+        if policy not in EVICTION_POLICIES:
+            raise ValueError(f"Unknown eviction policy {policy!r}, expected one of {EVICTION_POLICIES}")
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.policy = policy
+        
+        self._lock = threading.Lock()
+        # key -> [value, size, expires_at, uses, tables]; order is least recently used first
+        self._entries = OrderedDict()
+        self._bytes = 0
+        # 'lfu' only: use count -> keys with that count, least recently used first
+        self._by_uses = {}
+        self._min_uses = 0
+        # (expires_at, sequence, key) for entries with a ttl; may hold removed keys
+        self._expiry = []
+        self._sequence = itertools.count()
+        # table -> keys of entries reading it; None collects untagged entries
+        self._by_table = {}
+        self._generation = 0
+        # table -> generation of its last invalidation; None -> last full invalidation
+        self._invalidated = {None: 0}
+        self._counters = {'hits': 0, 'misses': 0, 'evictions': 0, 'expirations': 0, 'invalidations': 0}
+        _caches.add(self)
+
+    def get(self, key):
+        """
+        Look up a cached result.
+        
+        Args:
+            key: Cache key
+        
+        Returns:
+            tuple: (True, value) on a hit, (False, None) on a miss
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[2] is not None and entry[2] <= time.monotonic():
+                self._remove(key)
+                self._counters['expirations'] += 1
+                entry = None
+            if entry is None:
+                self._counters['misses'] += 1
+                return False, None
+            
+            if self.policy == 'lfu':
+                self._bucket_move(key, entry[3], entry[3] + 1)
+            entry[3] += 1
+            self._entries.move_to_end(key)
+            self._counters['hits'] += 1
+            return True, entry[0]
+
+    def generation(self):
+        """
+        Current invalidation generation, to pass to put() as since.
+        """
+        with self._lock:
+            return self._generation
+
+    def put(self, key, value, ttl=None, tables=None, since=None):
+        """
+        Store a result, evicting others as needed to stay within the bounds.
+        Room is made before the new entry goes in, so it is never the victim
+        itself. A result larger than max_bytes on its own is not cached.
+        
+        Args:
+            key: Cache key
+            value: Query result
+            ttl (float): Overrides the cache's ttl for this entry
+            tables (frozenset): Tables the result was read from; empty or None if unknown
+            since (int): generation() read before the query ran; the result is
+                not stored if its tables were invalidated after that
+        """
+        if self.max_entries is not None and self.max_entries <= 0:
+            return
+        size = estimate_size(value)
+        if self.max_bytes is not None and size > self.max_bytes:
+            return
+        ttl = self.ttl if ttl is None else ttl
+        expires_at = time.monotonic() + ttl if ttl is not None else None
+        
+        tags = tuple(tables) if tables else (None,)
+        
+        with self._lock:
+            if since is not None and self._stale_since(since, tags):
+                return
+            if key in self._entries:
+                self._remove(key)
+            
+            # Dead entries go before any live one is evicted
+            self._expire(time.monotonic())
+            # Under 'lfu' a new entry has the fewest uses, so it would be evicted first
+            while self._entries and (
+                    (self.max_entries is not None and len(self._entries) >= self.max_entries)
+                    or (self.max_bytes is not None and self._bytes + size > self.max_bytes)):
+                self._remove(self._victim())
+                self._counters['evictions'] += 1
+            
+            self._entries[key] = [value, size, expires_at, 0, tags]
+            self._bytes += size
+            for table in tags:
+                self._by_table.setdefault(table, set()).add(key)
+            if self.policy == 'lfu':
+                self._by_uses.setdefault(0, OrderedDict())[key] = None
+                self._min_uses = 0
+            if expires_at is not None:
+                heapq.heappush(self._expiry, (expires_at, next(self._sequence), key))
+                if len(self._expiry) > 2 * len(self._entries) + 64:
+                    # Mostly keys removed before they expired; rebuild from live entries
+                    self._expiry = [(entry[2], next(self._sequence), live_key)
+                                    for live_key, entry in self._entries.items() if entry[2] is not None]
+                    heapq.heapify(self._expiry)
+
+    def _stale_since(self, since, tags):
+        """
+        Whether an invalidation after generation since covers tags (called with the lock held).
+        """
+        if tags == (None,):
+            # Untagged entries are dropped by every invalidation
+            return self._generation > since
+        if self._invalidated[None] > since:
+            return True
+        return any(self._invalidated.get(table, 0) > since for table in tags)
+
+    def _expire(self, now):
+        """
+        Drop every entry whose ttl has passed (called with the lock held).
+        """
+        expiry = self._expiry
+        while expiry and expiry[0][0] <= now:
+            _, _, key = heapq.heappop(expiry)
+            entry = self._entries.get(key)
+            # The key may have been removed, or replaced by a later entry
+            if entry is not None and entry[2] is not None and entry[2] <= now:
+                self._remove(key)
+                self._counters['expirations'] += 1
+
+    def _victim(self):
+        """
+        Key to evict next under the cache's policy (called with the lock held).
+        """
+        if self.policy == 'lru':
+            return next(iter(self._entries))
+        if self._min_uses not in self._by_uses:
+            # Only after removals outside eviction; the number of distinct counts is small
+            self._min_uses = min(self._by_uses)
+        # Each bucket is ordered by arrival, so ties go to the least recently used
+        return next(iter(self._by_uses[self._min_uses]))
+
+    def _bucket_move(self, key, uses, new_uses):
+        bucket = self._by_uses[uses]
+        del bucket[key]
+        if not bucket:
+            del self._by_uses[uses]
+            if self._min_uses == uses:
+                self._min_uses = new_uses
+        self._by_uses.setdefault(new_uses, OrderedDict())[key] = None
+
+    def _remove(self, key):
+        entry = self._entries.pop(key)
+        self._bytes -= entry[1]
+        if self.policy == 'lfu':
+            bucket = self._by_uses[entry[3]]
+            del bucket[key]
+            if not bucket:
+                del self._by_uses[entry[3]]
+        for table in entry[4]:
+            keys = self._by_table[table]
+            keys.discard(key)
+            if not keys:
+                del self._by_table[table]
+
+    def invalidate(self, tables=None):
+        """
+        Drop the results read from any of tables, plus untagged results.
+        
+        Args:
+            tables (Iterable[str]): Table names; None drops everything
+        
+        Returns:
+            int: Number of entries dropped
+        """
+        with self._lock:
+            self._generation += 1
+            if tables is None:
+                self._invalidated[None] = self._generation
+                keys = set(self._entries)
+            else:
+                keys = set(self._by_table.get(None, ()))
+                for table in tables:
+                    self._invalidated[table.lower()] = self._generation
+                    keys.update(self._by_table.get(table.lower(), ()))
+            for key in keys:
+                self._remove(key)
+            self._counters['invalidations'] += len(keys)
+            return len(keys)
+
+    def clear(self):
+        """
+        Drop every cached result.
+        """
+        with self._lock:
+            self._entries.clear()
+            self._by_table.clear()
+            self._by_uses.clear()
+            self._expiry = []
+            self._bytes = 0
+
+    def stats(self):
+        """
+        Snapshot of cache counters.
+        
+        Returns:
+            dict: hits, misses, evictions, expirations, invalidations, entries, bytes and hit_rate
+        """
+        with self._lock:
+            stats = dict(self._counters)
+            stats['entries'] = len(self._entries)
+            stats['bytes'] = self._bytes
+        lookups = stats['hits'] + stats['misses']
+        stats['hit_rate'] = stats['hits'] / lookups if lookups else 0.0
+        return stats
+
+    def __contains__(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            return entry is not None and (entry[2] is None or entry[2] > time.monotonic())
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
+
+
+# Every QueryCache, so a write can invalidate all of them
+_caches = weakref.WeakSet()
+
+# Shared by every bare @cache_query function
+query_cache = QueryCache()
+
+
+def invalidate(*tables):
+    """
+    Drop cached results read from any of tables in every QueryCache.
+    Called automatically when a pooled connection commits writes (e.g. via
+    transactional); call it directly after writes made some other way.
+    
+    Args:
+        *tables (str): Table names; none at all drops every cached result
+    
+    Returns:
+        int: Number of entries dropped
+    """
+    return sum(cache.invalidate(tables or None) for cache in list(_caches))
+
+
+on_tables_written(lambda tables: invalidate(*(tables or ())))
+
+
+def cache_query(func=None, *, cache=None, ttl=None):
+    """
+    Decorator that caches query results keyed by the SQL query string and
+    any other arguments (such as bound parameters) after the connection.
+    
+    Can be used bare (@cache_query, sharing query_cache) or with options
+    (@cache_query(cache=QueryCache(max_bytes=2 ** 20, ttl=60))).
+    
+    Args:
+        cache (QueryCache): Cache to use instead of query_cache
+        ttl (float): Per-entry TTL overriding the cache's own
+    """
+    if func is None:
+        return functools.partial(cache_query, cache=cache, ttl=ttl)
+    
     @functools.wraps(func)
     def wrapper(*args, **kwargs):
         # Extract the query from kwargs or args
@@ -23,44 +341,35 @@ def cache_query(func):
                 # If we can't find the query, don't cache
                 return func(*args, **kwargs)
         
+        # The connection is not part of the key, everything else is
+        extra = tuple(sorted((name, value) for name, value in kwargs.items() if name != 'query'))
+        try:
+            key = (query, args[2:], extra)
+            hash(key)
+        except TypeError:
+            # Unhashable arguments (e.g. a list of params) cannot be cached
+            return func(*args, **kwargs)
+        
+        results = cache if cache is not None else query_cache
+        
         # Check if result is already cached
-        if query in query_cache:
-            print(f"Cache hit for query: {query[:50]}...")
-            return query_cache[query]
+        hit, result = results.get(key)
+        if hit:
+            return result
         
-        # Execute the function and cache the result
-        print(f"Cache miss for query: {query[:50]}...")
+        # Execute the function and cache the result, unless a write
+        # invalidated its tables while it ran
+        since = results.generation()
         result = func(*args, **kwargs)
-        query_cache[query] = result
+        results.put(key, result, ttl, tables_in_query(query) if isinstance(query, str) else None, since)
         
         return result
     
     return wrapper
 
-def with_db_connection(func):
-    """
-    Decorator that automatically handles database connection opening and closing.
-    Creates a connection, passes it as the first argument to the decorated function,
-    and ensures the connection is closed afterward.
-    """
-    @functools.wraps(func)
-    def wrapper(*args, **kwargs):
-        # Open database connection
-        conn = sqlite3.connect('users.db')
-        
-        try:
-            # Call the original function with connection as first argument
-            result = func(conn, *args, **kwargs)
-            return result
-        finally:
-            # Always close the connection, even if an exception occurs
-            conn.close()
-    
-    return wrapper
-
 @with_db_connection
 @cache_query
 def fetch_users_with_cache(conn, query):
     cursor = conn.cursor()
     cursor.execute(query)
-    return cursor.fetchall()
\ No newline at end of file
+    return cursor.fetchall()
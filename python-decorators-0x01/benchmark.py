@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+"""
+Benchmarks for the database decorators in python-decorators-0x01.
+Each benchmark builds its own throwaway database, for example:
+
+    python3 benchmark.py profiles --readers 8 --seconds 5
+    python3 benchmark.py statements --lookups 100000
+"""
+
+import argparse
+import os
+import random
+import sqlite3
+import tempfile
+import threading
+import time
+
+from db_pool import PROFILES, SQLitePool, with_db_connection
+
+
+def create_users_db(path, rows):
+    """
+    Create a users table with rows synthetic users at path.
+    
+    Args:
+        path (str): Database file to create
+        rows (int): Number of users to insert
+    """
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE users (id INTEGER PRIMARY KEY, name TEXT NOT NULL, "
+                 "email TEXT NOT NULL, age INTEGER)")
+    conn.executemany("INSERT INTO users (name, email, age) VALUES (?, ?, ?)",
+                     ((f"User {i}", f"user{i}@example.com", 18 + i % 60) for i in range(rows)))
+    conn.commit()
+    conn.close()
+
+
+def percentile(values, fraction):
+    """
+    Nearest-rank percentile of values (0.0 for an empty list).
+    """
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def bench_profiles(readers, seconds, rows):
+    """
+    Compare read and write throughput of each tuning profile while reader
+    threads run point lookups alongside one writer committing updates.
+    Lock errors ("database is locked") are counted rather than retried.
+    
+    Args:
+        readers (int): Number of concurrent reader threads
+        seconds (float): How long each profile runs
+        rows (int): Size of the users table
+    """
+    print(f"Profile benchmark: readers={readers}, writer=1, seconds={seconds}, rows={rows}")
+    print(f"{'Profile':<12} | {'Reads/s':>10} | {'Read p99 ms':>11} | {'Writes/s':>9} | {'Write p99 ms':>12} | {'Errors':>6}")
+    print("-" * 76)
+    
+    for profile in PROFILES:
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'users.db')
+            create_users_db(path, rows)
+            pool = SQLitePool(path, size=readers + 1, profile=profile)
+            
+            @with_db_connection(pool=pool)
+            def get_user_by_id(conn, user_id):
+                return conn.execute("SELECT * FROM users WHERE id = ?", (user_id,)).fetchone()
+            
+            # Committed inline: importing 2-transactional would run its demo against users.db
+            @with_db_connection(pool=pool)
+            def update_user_email(conn, user_id, new_email):
+                conn.execute("UPDATE users SET email = ? WHERE id = ?", (new_email, user_id))
+                conn.commit()
+            
+            stop = threading.Event()
+            lock = threading.Lock()
+            latencies = {'read': [], 'write': []}
+            errors = [0]
+            
+            def run(kind):
+                local = []
+                generator = random.Random()
+                while not stop.is_set():
+                    user_id = generator.randint(1, rows)
+                    start = time.perf_counter()
+                    try:
+                        if kind == 'read':
+                            get_user_by_id(user_id)
+                        else:
+                            update_user_email(user_id, f"user{user_id}.{start}@example.com")
+                    except sqlite3.OperationalError:
+                        with lock:
+                            errors[0] += 1
+                        continue
+                    local.append(time.perf_counter() - start)
+                with lock:
+                    latencies[kind].extend(local)
+            
+            threads = [threading.Thread(target=run, args=('read',)) for _ in range(readers)]
+            threads.append(threading.Thread(target=run, args=('write',)))
+            for thread in threads:
+                thread.start()
+            time.sleep(seconds)
+            stop.set()
+            for thread in threads:
+                thread.join()
+            pool.close_all()
+            
+            reads, writes = latencies['read'], latencies['write']
+            print(f"{profile:<12} | {len(reads) / seconds:>10.0f} | {percentile(reads, 0.99) * 1000:>11.3f} | "
+                  f"{len(writes) / seconds:>9.0f} | {percentile(writes, 0.99) * 1000:>12.3f} | {errors[0]:>6}")
+
+
+def bench_statements(lookups, rows, cache_size):
+    """
+    Point-lookup latency of get_user_by_id-style calls: a fresh connection
+    per call (the original with_db_connection), a pooled connection with
+    sqlite3's statement cache disabled, and a pooled connection with it on.
+    
+    Args:
+        lookups (int): Number of lookups per variant
+        rows (int): Size of the users table
+        cache_size (int): Statement cache entries per pooled connection
+    """
+    query = "SELECT * FROM users WHERE id = ?"
+    
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'users.db')
+        create_users_db(path, rows)
+        
+        def connect_per_call(user_id):
+            conn = sqlite3.connect(path)
+            try:
+                return conn.execute(query, (user_id,)).fetchone()
+            finally:
+                conn.close()
+        
+        pools = {
+            'pooled, no statement cache': SQLitePool(path, size=1, statement_cache_size=0),
+            'pooled, statement cache': SQLitePool(path, size=1, statement_cache_size=cache_size),
+        }
+        variants = {'connection per call': connect_per_call}
+        for name, pool in pools.items():
+            variants[name] = with_db_connection(pool=pool)(
+                lambda conn, user_id: conn.execute(query, (user_id,)).fetchone())
+        
+        print(f"Statement cache benchmark: lookups={lookups}, rows={rows}, cache_size={cache_size}")
+        print(f"{'Variant':<28} | {'Mean us':>8} | {'p50 us':>8} | {'p99 us':>8} | {'Hit rate':>8}")
+        print("-" * 72)
+        
+        generator = random.Random(42)
+        user_ids = [generator.randint(1, rows) for _ in range(lookups)]
+        for name, lookup in variants.items():
+            latencies = []
+            for user_id in user_ids:
+                start = time.perf_counter()
+                lookup(user_id)
+                latencies.append(time.perf_counter() - start)
+            
+            hit_rate = f"{pools[name].statement_stats()['hit_rate']:.1%}" if name in pools else '-'
+            print(f"{name:<28} | {sum(latencies) / len(latencies) * 1e6:>8.1f} | "
+                  f"{percentile(latencies, 0.50) * 1e6:>8.1f} | {percentile(latencies, 0.99) * 1e6:>8.1f} | {hit_rate:>8}")
+        
+        for pool in pools.values():
+            pool.close_all()
+
+
+def main():
+    """
+    Parse command line arguments and run the selected benchmark.
+    """
+    parser = argparse.ArgumentParser(description="Benchmarks for python-decorators-0x01")
+    subparsers = parser.add_subparsers(dest='benchmark', required=True)
+    
+    profiles = subparsers.add_parser('profiles', help="read/write throughput per SQLite tuning profile")
+    profiles.add_argument('--readers', type=int, default=4)
+    profiles.add_argument('--seconds', type=float, default=3.0)
+    profiles.add_argument('--rows', type=int, default=100000)
+    
+    statements = subparsers.add_parser('statements', help="point-lookup latency with and without the statement cache")
+    statements.add_argument('--lookups', type=int, default=100000)
+    statements.add_argument('--rows', type=int, default=100000)
+    statements.add_argument('--cache-size', type=int, default=128)
+    
+    args = parser.parse_args()
+    
+    if args.benchmark == 'profiles':
+        bench_profiles(args.readers, args.seconds, args.rows)
+    elif args.benchmark == 'statements':
+        bench_statements(args.lookups, args.rows, args.cache_size)
+
+
+if __name__ == "__main__":
+    main()
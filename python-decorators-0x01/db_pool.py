@@ -0,0 +1,601 @@
+import os
+import re
+import sqlite3
+import threading
+import time
+import functools
+import weakref
+from collections import OrderedDict, deque
+
+
+# Named PRAGMA sets applied to every new connection. 'default' keeps SQLite's
+# own settings (rollback journal, synchronous=FULL, ~2 MiB page cache);
+# 'performance' trades durability of the last commits on power loss (not on
+# a crash) for far fewer fsyncs, and lets readers run alongside a writer.
+# journal_mode=WAL is persistent: the database file stays in WAL mode after
+# the connection closes, with -wal and -shm sidecar files next to it.
+# python-context-async-perations-0x02's DatabaseConnection takes one of
+# these dicts as its pragmas rather than keeping a copy.
+PROFILES = {
+    'default': {},
+    'performance': {
+        'busy_timeout': 5000,
+        'journal_mode': 'WAL',
+        'synchronous': 'NORMAL',
+        'cache_size': -65536,
+        'mmap_size': 268435456,
+        'temp_store': 'MEMORY',
+    },
+    'durable': {
+        'busy_timeout': 5000,
+        'journal_mode': 'WAL',
+        'synchronous': 'FULL',
+    },
+}
+
+
+def apply_profile(conn, profile):
+    """
+    Apply a tuning profile to an open connection.
+    
+    Args:
+        conn (sqlite3.Connection): The connection
+        profile (str or dict): Name from PROFILES, or a {pragma: value} dict
+    """
+    pragmas = PROFILES[profile] if isinstance(profile, str) else profile
+    for pragma, value in pragmas.items():
+        # journal_mode answers with a row, which must be read before moving on
+        conn.execute(f"PRAGMA {pragma} = {value}").fetchall()
+
+
+# Table references: the name after FROM/JOIN/UPDATE/INTO up to the end of
+# its clause; FROM may list several tables separated by commas, and UPDATE
+# may carry a conflict clause (UPDATE OR IGNORE users ...). Comments and
+# string literals are removed first, and quoted identifiers are masked
+# while clauses are found, so neither can add or hide a table.
+SQL_NOISE = re.compile(r"'(?:[^']|'')*'|--[^\n]*|/\*.*?(?:\*/|$)|`[^`]*`|\"[^\"]*\"|\[[^\]]*\]", re.DOTALL)
+QUOTED_IDENTIFIER = re.compile(r"`[^`]*`|\"[^\"]*\"|\[[^\]]*\]")
+TABLE_KEYWORD = re.compile(r"\b(from|join|update|into)\b", re.IGNORECASE)
+CLAUSE_END = re.compile(r"\b(?:where|group|order|limit|having|join|on|using|union|set|values|select|"
+                        r"left|right|inner|outer|cross|natural|default)\b|[;()]", re.IGNORECASE)
+IDENTIFIER = r"(?:`([^`]+)`|\"([^\"]+)\"|\[([^\]]+)\]|(\w+))"
+TABLE_NAME = re.compile(r"\s*(?:or\s+\w+\s+)?(?:(?:`[^`]+`|\"[^\"]+\"|\[[^\]]+\]|\w+)\s*\.\s*)?" + IDENTIFIER,
+                        re.IGNORECASE)
+
+STATEMENT_VERB = re.compile(r"\s*(\w*)")
+WRITE_KEYWORD = re.compile(r"\b(?:insert|update|delete|replace)\b", re.IGNORECASE)
+WRITE_STATEMENTS = ('insert', 'update', 'delete', 'replace')
+# Statements that never change table contents; anything not listed here or
+# in WRITE_STATEMENTS (CREATE, DROP, ALTER, VACUUM, ...) counts as unknown
+READ_STATEMENTS = ('select', 'values', 'explain', 'pragma', 'begin', 'commit', 'end',
+                   'rollback', 'savepoint', 'release')
+
+_write_listeners = []
+
+
+def _strip_sql(sql):
+    """
+    sql with comments removed and string literals emptied; quoted identifiers are kept.
+    """
+    def replace(match):
+        text = match.group(0)
+        if text.startswith("'"):
+            return "''"
+        if text.startswith(('--', '/*')):
+            return ' '
+        return text
+    return SQL_NOISE.sub(replace, sql)
+
+
+def _mask_identifier(match):
+    # Same length, so positions in the masked text match the original
+    text = match.group(0)
+    return text[0] + '_' * (len(text) - 2) + text[-1]
+
+
+@functools.lru_cache(maxsize=1024)
+def tables_in_query(sql):
+    """
+    Names of the tables a statement reads or writes, lowercased and without
+    schema prefixes or quoting. Tables inside subqueries are included.
+    
+    Args:
+        sql (str): The SQL statement
+    
+    Returns:
+        frozenset: Table names (empty if none could be found)
+    """
+    sql = _strip_sql(sql)
+    masked = QUOTED_IDENTIFIER.sub(_mask_identifier, sql)
+    tables = set()
+    for keyword in TABLE_KEYWORD.finditer(masked):
+        start = keyword.end()
+        end = CLAUSE_END.search(masked, start)
+        stop = end.start() if end else len(masked)
+        
+        # Split FROM lists on commas outside quoted identifiers
+        bounds = [start]
+        if keyword.group(1).lower() == 'from':
+            bounds.extend(index + 1 for index in range(start, stop) if masked[index] == ',')
+        bounds.append(stop + 1)
+        for item_start, item_end in zip(bounds, bounds[1:]):
+            name = TABLE_NAME.match(sql[item_start:item_end - 1])
+            if name:
+                tables.add(next(group for group in name.groups() if group is not None).lower())
+    return frozenset(tables)
+
+
+@functools.lru_cache(maxsize=1024)
+def tables_written_by(sql):
+    """
+    Tables a statement may write.
+    
+    Args:
+        sql (str): The SQL statement
+    
+    Returns:
+        frozenset: Tables written (empty for statements that write nothing),
+        or None if the statement may write tables that cannot be named
+    """
+    stripped = _strip_sql(sql)
+    verb = STATEMENT_VERB.match(stripped).group(1).lower()
+    if verb in READ_STATEMENTS:
+        return frozenset()
+    if verb == 'with' and not WRITE_KEYWORD.search(QUOTED_IDENTIFIER.sub('""', stripped)):
+        return frozenset()
+    if verb in WRITE_STATEMENTS or verb == 'with':
+        # Every table mentioned, so reads of CTEs and subqueries are included too
+        return tables_in_query(sql) or None
+    return None
+
+
+def on_tables_written(callback):
+    """
+    Register callback(tables) to run after a commit that wrote to tables;
+    tables is None when the written tables are unknown (treat as all).
+    """
+    _write_listeners.append(callback)
+
+
+def tables_written(tables):
+    """
+    Tell every listener registered with on_tables_written about a commit.
+    
+    Args:
+        tables (frozenset): Tables written, or None if unknown
+    """
+    for callback in list(_write_listeners):
+        callback(tables)
+
+
+class StatementCache:
+    """
+    LRU of SQL texts mirroring the statement cache sqlite3 keeps per
+    connection (sized by cached_statements), so its hits and misses can be
+    counted. It caches nothing itself: sqlite3 does the actual reuse of
+    compiled statements, and a hit here means sqlite3 skipped
+    sqlite3_prepare for that call.
+    """
+    
+    def __init__(self, size):
+        self.size = size
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._statements = OrderedDict()
+    
+    def lookup(self, sql):
+        """
+        Record one execution of sql and report whether it was already cached.
+        """
+        if sql in self._statements:
+            self._statements.move_to_end(sql)
+            self.hits += 1
+            return True
+        self.misses += 1
+        if self.size > 0:
+            self._statements[sql] = None
+            if len(self._statements) > self.size:
+                self._statements.popitem(last=False)
+                self.evictions += 1
+        return False
+    
+    def reset_counters(self):
+        """
+        Zero the hit, miss and eviction counters, keeping the cached texts
+        in step with sqlite3's own cache.
+        """
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+    
+    def stats(self):
+        """
+        Counters and current size of the cache.
+        """
+        return {'size': len(self._statements), 'capacity': self.size, 'hits': self.hits,
+                'misses': self.misses, 'evictions': self.evictions}
+
+
+class StatementCountingCursor(sqlite3.Cursor):
+    """
+    Cursor that records every statement in its connection's StatementCache.
+    """
+    
+    def execute(self, sql, parameters=()):
+        self.connection.statements.lookup(sql)
+        self.connection.record_write(sql)
+        try:
+            return super().execute(sql, parameters)
+        finally:
+            self.connection.flush_writes()
+    
+    def executemany(self, sql, seq_of_parameters):
+        self.connection.statements.lookup(sql)
+        self.connection.record_write(sql)
+        try:
+            return super().executemany(sql, seq_of_parameters)
+        finally:
+            self.connection.flush_writes()
+    
+    def executescript(self, sql_script):
+        # Scripts are not parsed statement by statement
+        self.connection.written_tables = None
+        try:
+            return super().executescript(sql_script)
+        finally:
+            self.connection.flush_writes()
+
+
+class CachingConnection(sqlite3.Connection):
+    """
+    sqlite3 connection (use as sqlite3.connect(..., factory=CachingConnection))
+    whose statement cache hits and misses are counted in self.statements.
+    
+    It also remembers which tables the open transaction has written and
+    passes them to tables_written once they are committed: by commit(), by
+    leaving a "with conn:" block, by a COMMIT statement, or straight away
+    when a statement runs outside a transaction (isolation_level=None, or
+    DDL under sqlite3's implicit transactions). Caches of reads from those
+    tables can then be invalidated. A ROLLBACK statement is treated like a
+    commit, which at worst invalidates more than needed.
+    """
+    
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.statements = StatementCache(kwargs.get('cached_statements', 128))
+        # None once a schema change makes the affected tables unknowable
+        self.written_tables = set()
+    
+    def record_write(self, sql):
+        """
+        Note the tables a statement writes, if it writes any.
+        """
+        if self.written_tables is None:
+            return
+        tables = tables_written_by(sql)
+        if tables is None:
+            self.written_tables = None
+        else:
+            self.written_tables.update(tables)
+    
+    def flush_writes(self):
+        """
+        Report the recorded writes to tables_written unless a transaction is
+        still open, i.e. once they are committed.
+        """
+        if self.in_transaction:
+            return
+        written, self.written_tables = self.written_tables, set()
+        if written is None or written:
+            tables_written(None if written is None else frozenset(written))
+    
+    def commit(self):
+        super().commit()
+        self.flush_writes()
+    
+    def rollback(self):
+        super().rollback()
+        self.written_tables = set()
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        # sqlite3 commits or rolls back here without calling commit()/rollback()
+        result = super().__exit__(exc_type, exc_value, traceback)
+        if exc_type is None:
+            self.flush_writes()
+        else:
+            self.written_tables = set()
+        return result
+    
+    def cursor(self, factory=StatementCountingCursor):
+        return super().cursor(factory)
+    
+    def execute(self, sql, parameters=()):
+        return self.cursor().execute(sql, parameters)
+    
+    def executemany(self, sql, seq_of_parameters):
+        return self.cursor().executemany(sql, seq_of_parameters)
+    
+    def executescript(self, sql_script):
+        return self.cursor().executescript(sql_script)
+
+
+class PoolTimeout(Exception):
+    """
+    Raised when no pooled connection becomes free in time.
+    """
+
+
+class SQLitePool:
+    """
+    Bounded, thread-safe pool of sqlite3 connections to one database file.
+    
+    Connections are opened lazily, reused most-recently-returned first and
+    closed once they have been idle longer than idle_timeout seconds. Each new
+    connection gets the PRAGMAs of the pool's tuning profile. They are
+    opened with check_same_thread=False so any thread may check one out, but
+    each connection is only ever used by one caller at a time. The time spent
+    waiting for every checkout is recorded.
+    
+    Because connections outlive each call, sqlite3's per-connection statement
+    cache (statement_cache_size entries, LRU) lets repeated queries skip
+    re-parsing their SQL; statement_stats() reports its hit rate.
+    """
+
+    def __init__(self, database='users.db', size=5, idle_timeout=300.0, timeout=30.0,
+                 wait_window=1024, profile='performance', statement_cache_size=128):
+        """
+        Initialize the pool.
+        
+        Args:
+            database (str): Path to the SQLite database file
+            size (int): Maximum number of open connections
+            idle_timeout (float): Seconds after which an idle connection is closed
+            timeout (float): Seconds to wait for a free connection before raising PoolTimeout
+            wait_window (int): Number of recent checkout waits kept for percentiles
+            profile (str or dict): Tuning profile, see PROFILES
+            statement_cache_size (int): Compiled statements kept per connection; 0 disables
+        """
+        if size <= 0:
+            raise ValueError("Pool size must be a positive integer")
+        if isinstance(profile, str) and profile not in PROFILES:
+            raise ValueError(f"Unknown profile {profile!r}, expected one of {list(PROFILES)}")
+        
+        self.database = database
+        self.size = size
+        self.idle_timeout = idle_timeout
+        self.timeout = timeout
+        self.profile = profile
+        self.statement_cache_size = statement_cache_size
+        self._connections = weakref.WeakSet()
+        
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(size)
+        self._idle = deque()
+        self._waits = deque(maxlen=wait_window)
+        self._counters = {
+            'checkouts': 0,
+            'created': 0,
+            'evicted_idle': 0,
+            'discarded': 0,
+            'in_use': 0,
+        }
+        self._total_wait = 0.0
+        self._max_wait = 0.0
+
+    def connect(self):
+        """
+        Open a new connection for the pool and apply its tuning profile.
+        """
+        conn = sqlite3.connect(self.database, check_same_thread=False, factory=CachingConnection,
+                               cached_statements=self.statement_cache_size)
+        try:
+            apply_profile(conn, self.profile)
+        except sqlite3.Error:
+            conn.close()
+            raise
+        # Count application queries only, not the profile's PRAGMAs
+        conn.statements.reset_counters()
+        self._connections.add(conn)
+        return conn
+
+    def get_connection(self):
+        """
+        Check a connection out of the pool, opening a new one if none is idle.
+        Hand it back with release() (or discard() if it is broken).
+        
+        Returns:
+            sqlite3.Connection: The connection
+        
+        Raises:
+            PoolTimeout: If no connection becomes free within the timeout
+        """
+        start = time.perf_counter()
+        if not self._slots.acquire(timeout=self.timeout):
+            raise PoolTimeout(f"No connection to {self.database} available within {self.timeout} seconds")
+        
+        try:
+            conn = self._take_idle()
+            if conn is None:
+                conn = self.connect()
+                with self._lock:
+                    self._counters['created'] += 1
+        except Exception:
+            self._slots.release()
+            raise
+        
+        wait = time.perf_counter() - start
+        with self._lock:
+            self._counters['checkouts'] += 1
+            self._counters['in_use'] += 1
+            self._waits.append(wait)
+            self._total_wait += wait
+            self._max_wait = max(self._max_wait, wait)
+        return conn
+
+    def _take_idle(self):
+        """
+        Pop the most recently returned idle connection, closing expired ones.
+        """
+        while True:
+            with self._lock:
+                if not self._idle:
+                    return None
+                conn, returned_at = self._idle.pop()
+            
+            if time.monotonic() - returned_at > self.idle_timeout:
+                conn.close()
+                with self._lock:
+                    self._counters['evicted_idle'] += 1
+                continue
+            return conn
+
+    def release(self, conn):
+        """
+        Return a checked-out connection to the pool.
+        An open transaction is rolled back so the next user starts clean.
+        """
+        try:
+            if conn.in_transaction:
+                conn.rollback()
+        except sqlite3.Error:
+            conn.close()
+            with self._lock:
+                self._counters['discarded'] += 1
+        else:
+            with self._lock:
+                self._idle.append((conn, time.monotonic()))
+        finally:
+            with self._lock:
+                self._counters['in_use'] -= 1
+            self._slots.release()
+
+    def discard(self, conn):
+        """
+        Close a checked-out connection and free its slot without reusing it.
+        """
+        try:
+            conn.close()
+        except sqlite3.Error:
+            pass
+        finally:
+            with self._lock:
+                self._counters['in_use'] -= 1
+                self._counters['discarded'] += 1
+            self._slots.release()
+
+    def close_all(self):
+        """
+        Close every idle connection. Checked-out connections are unaffected.
+        """
+        with self._lock:
+            idle, self._idle = list(self._idle), deque()
+        for conn, _ in idle:
+            conn.close()
+
+    def stats(self):
+        """
+        Snapshot of pool counters and checkout wait metrics.
+        
+        Returns:
+            dict: Counters plus idle count and wait mean/p50/p99/max in seconds
+        """
+        with self._lock:
+            stats = dict(self._counters)
+            stats['idle'] = len(self._idle)
+            waits = sorted(self._waits)
+            checkouts = self._counters['checkouts']
+            stats['wait_mean_seconds'] = self._total_wait / checkouts if checkouts else 0.0
+            stats['wait_max_seconds'] = self._max_wait
+        
+        if waits:
+            stats['wait_p50_seconds'] = waits[len(waits) // 2]
+            stats['wait_p99_seconds'] = waits[min(len(waits) - 1, int(len(waits) * 0.99))]
+        else:
+            stats['wait_p50_seconds'] = 0.0
+            stats['wait_p99_seconds'] = 0.0
+        return stats
+
+
+    def statement_stats(self):
+        """
+        Statement cache counters summed over the pool's open connections.
+        
+        Returns:
+            dict: hits, misses, evictions and hit_rate
+        """
+        totals = {'hits': 0, 'misses': 0, 'evictions': 0}
+        for conn in list(self._connections):
+            for name in totals:
+                totals[name] += getattr(conn.statements, name)
+        lookups = totals['hits'] + totals['misses']
+        totals['hit_rate'] = totals['hits'] / lookups if lookups else 0.0
+        return totals
+
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(database=None, profile=None):
+    """
+    Returns the shared pool for a database file and tuning profile, creating
+    it on first use. The defaults come from SQLITE_DB_PATH (default users.db)
+    and SQLITE_PROFILE (default performance), and the pool limits from
+    SQLITE_POOL_SIZE, SQLITE_POOL_IDLE_TIMEOUT and SQLITE_POOL_TIMEOUT.
+    
+    Args:
+        database (str): Path to the SQLite database file
+        profile (str): Name of a tuning profile in PROFILES
+    
+    Returns:
+        SQLitePool: The pool for that file and profile
+    """
+    if database is None:
+        database = os.environ.get('SQLITE_DB_PATH', 'users.db')
+    if profile is None:
+        profile = os.environ.get('SQLITE_PROFILE', 'performance')
+    with _pools_lock:
+        pool = _pools.get((database, profile))
+        if pool is None:
+            pool = _pools[(database, profile)] = SQLitePool(
+                database,
+                size=int(os.environ.get('SQLITE_POOL_SIZE', '5')),
+                idle_timeout=float(os.environ.get('SQLITE_POOL_IDLE_TIMEOUT', '300')),
+                timeout=float(os.environ.get('SQLITE_POOL_TIMEOUT', '30')),
+                profile=profile,
+            )
+        return pool
+
+
+def with_db_connection(func=None, *, database=None, profile=None, pool=None):
+    """
+    Decorator that checks a connection out of a shared pool, passes it as the
+    first argument to the decorated function, and returns it to the pool
+    afterward (rolling back anything left uncommitted).
+    
+    Can be used bare (@with_db_connection) or with options
+    (@with_db_connection(database='other.db', profile='durable')).
+    
+    Args:
+        database (str): Database file; defaults to SQLITE_DB_PATH or users.db
+        profile (str): Tuning profile from PROFILES; defaults to SQLITE_PROFILE or performance
+        pool (SQLitePool): Pool to use instead of get_pool(database, profile)
+    """
+    if func is None:
+        return functools.partial(with_db_connection, database=database, profile=profile, pool=pool)
+    
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        # Check a connection out of the pool
+        connection_pool = pool or get_pool(database, profile)
+        conn = connection_pool.get_connection()
+        
+        try:
+            # Call the original function with connection as first argument
+            return func(conn, *args, **kwargs)
+        finally:
+            # Always hand the connection back, even if an exception occurs
+            connection_pool.release(conn)
+    
+    return wrapper
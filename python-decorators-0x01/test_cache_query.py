@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""Unit tests for QueryCache bounds, eviction policies and expiry."""
+
+import unittest
+from unittest.mock import patch
+
+cache_query_module = __import__('4-cache_query')
+QueryCache = cache_query_module.QueryCache
+
+
+class TestQueryCacheEviction(unittest.TestCase):
+    """Test cases for the QueryCache size bounds and eviction policies."""
+
+    def test_lru_evicts_least_recently_used(self) -> None:
+        """Test that 'lru' evicts the entry read longest ago."""
+        cache = QueryCache(max_entries=2, policy='lru')
+        cache.put('a', 1)
+        cache.put('b', 2)
+        cache.get('a')
+        cache.put('c', 3)
+        self.assertIn('a', cache)
+        self.assertNotIn('b', cache)
+        self.assertIn('c', cache)
+        self.assertEqual(cache.stats()['evictions'], 1)
+
+    def test_lfu_evicts_least_often_used(self) -> None:
+        """Test that 'lfu' evicts the entry read least often."""
+        cache = QueryCache(max_entries=2, policy='lfu')
+        cache.put('a', 1)
+        cache.put('b', 2)
+        cache.get('a')
+        cache.get('a')
+        cache.get('b')
+        cache.put('c', 3)
+        self.assertIn('a', cache)
+        self.assertNotIn('b', cache)
+
+    def test_lfu_counts_survive_removals(self) -> None:
+        """Test that 'lfu' still finds the least used entry after others are removed."""
+        cache = QueryCache(max_entries=3, policy='lfu')
+        cache.put('a', 1)
+        cache.put('b', 2)
+        cache.put('c', 3)
+        for key in ('a', 'a', 'b', 'b', 'c', 'c', 'c'):
+            cache.get(key)
+        cache.invalidate()
+        cache.put('d', 4)
+        cache.put('e', 5)
+        cache.get('d')
+        cache.put('f', 6)
+        cache.put('g', 7)
+        self.assertIn('d', cache)
+        self.assertNotIn('e', cache)
+
+    def test_lfu_ties_evict_least_recently_used(self) -> None:
+        """Test that 'lfu' breaks ties in favour of the oldest entry."""
+        cache = QueryCache(max_entries=2, policy='lfu')
+        cache.put('a', 1)
+        cache.put('b', 2)
+        cache.put('c', 3)
+        self.assertNotIn('a', cache)
+        self.assertIn('b', cache)
+
+    def test_unknown_policy(self) -> None:
+        """Test that an unknown policy raises ValueError."""
+        with self.assertRaises(ValueError):
+            QueryCache(policy='fifo')
+
+    def test_max_bytes(self) -> None:
+        """Test that entries are evicted to stay within max_bytes."""
+        rows = [(1, 'name', 'email@example.com')]
+        size = cache_query_module.estimate_size(rows)
+        cache = QueryCache(max_entries=None, max_bytes=size * 2)
+        cache.put('a', rows)
+        cache.put('b', rows)
+        cache.put('c', rows)
+        self.assertEqual(len(cache), 2)
+        self.assertNotIn('a', cache)
+        self.assertLessEqual(cache.stats()['bytes'], size * 2)
+
+    def test_oversized_result_not_cached(self) -> None:
+        """Test that a result larger than max_bytes is not stored."""
+        cache = QueryCache(max_bytes=100)
+        cache.put('a', [(i, 'x' * 50) for i in range(100)])
+        self.assertEqual(len(cache), 0)
+
+
+class TestQueryCacheTtl(unittest.TestCase):
+    """Test cases for QueryCache expiry."""
+
+    def test_entry_expires(self) -> None:
+        """Test that an entry is a miss once its ttl has passed."""
+        cache = QueryCache(ttl=10)
+        with patch.object(cache_query_module.time, 'monotonic', return_value=100.0):
+            cache.put('a', 1)
+            self.assertEqual(cache.get('a'), (True, 1))
+        with patch.object(cache_query_module.time, 'monotonic', return_value=110.0):
+            self.assertEqual(cache.get('a'), (False, None))
+        self.assertEqual(cache.stats()['expirations'], 1)
+        self.assertEqual(len(cache), 0)
+
+    def test_per_entry_ttl_overrides(self) -> None:
+        """Test that put's ttl overrides the cache's own."""
+        cache = QueryCache(ttl=None)
+        with patch.object(cache_query_module.time, 'monotonic', return_value=100.0):
+            cache.put('a', 1, ttl=5)
+            cache.put('b', 2)
+        with patch.object(cache_query_module.time, 'monotonic', return_value=1000.0):
+            self.assertNotIn('a', cache)
+            self.assertIn('b', cache)
+
+    def test_expired_entries_evicted_first(self) -> None:
+        """Test that expired entries are dropped before any live entry is evicted."""
+        for policy in ('lru', 'lfu'):
+            with self.subTest(policy=policy):
+                cache = QueryCache(max_entries=2, ttl=10, policy=policy)
+                with patch.object(cache_query_module.time, 'monotonic', return_value=100.0):
+                    cache.put('hot1', 1)
+                    cache.put('hot2', 2)
+                    for _ in range(5):
+                        cache.get('hot1')
+                        cache.get('hot2')
+                with patch.object(cache_query_module.time, 'monotonic', return_value=120.0):
+                    cache.put('new1', 3)
+                    cache.put('new2', 4)
+                    self.assertIn('new1', cache)
+                    self.assertIn('new2', cache)
+                    self.assertEqual(len(cache), 2)
+                stats = cache.stats()
+                self.assertEqual(stats['expirations'], 2)
+                self.assertEqual(stats['evictions'], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
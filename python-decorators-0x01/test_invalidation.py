@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""Unit tests for table extraction and write-driven cache invalidation."""
+
+import sqlite3
+import unittest
+from unittest.mock import patch
+from db_pool import CachingConnection, tables_in_query, tables_written_by
+
+cache_query_module = __import__('4-cache_query')
+QueryCache = cache_query_module.QueryCache
+cache_query = cache_query_module.cache_query
+
+
+class TestQueryCacheInvalidation(unittest.TestCase):
+    """Test cases for table-tagged invalidation."""
+
+    def test_invalidate_tables(self) -> None:
+        """Test that only entries reading the given tables, plus untagged ones, are dropped."""
+        cache = QueryCache()
+        cache.put('users', 1, tables=frozenset({'users'}))
+        cache.put('orders', 2, tables=frozenset({'orders'}))
+        cache.put('unknown', 3)
+        self.assertEqual(cache.invalidate(['Users']), 2)
+        self.assertNotIn('users', cache)
+        self.assertIn('orders', cache)
+        self.assertNotIn('unknown', cache)
+
+    def test_invalidate_everything(self) -> None:
+        """Test that invalidate() with no tables drops every entry."""
+        cache = QueryCache()
+        cache.put('users', 1, tables=frozenset({'users'}))
+        cache.put('orders', 2, tables=frozenset({'orders'}))
+        self.assertEqual(cache.invalidate(), 2)
+        self.assertEqual(len(cache), 0)
+
+    def test_put_skipped_after_concurrent_invalidation(self) -> None:
+        """Test that a result computed across an invalidation of its tables is not stored."""
+        cache = QueryCache()
+        since = cache.generation()
+        cache.invalidate(['users'])
+        cache.put('users', 1, tables=frozenset({'users'}), since=since)
+        cache.put('orders', 2, tables=frozenset({'orders'}), since=since)
+        cache.put('unknown', 3, since=since)
+        self.assertNotIn('users', cache)
+        self.assertIn('orders', cache)
+        self.assertNotIn('unknown', cache)
+
+    def test_put_skipped_after_full_invalidation(self) -> None:
+        """Test that a full invalidation during the query blocks every put."""
+        cache = QueryCache()
+        since = cache.generation()
+        cache.invalidate()
+        cache.put('orders', 2, tables=frozenset({'orders'}), since=since)
+        self.assertNotIn('orders', cache)
+
+    def test_decorator_skips_stale_result(self) -> None:
+        """Test that cache_query does not store a result whose tables were written while it ran."""
+        cache = QueryCache()
+
+        @cache_query(cache=cache)
+        def fetch(conn, query):
+            cache.invalidate(['users'])
+            return [(1,)]
+
+        fetch(None, "SELECT * FROM users")
+        self.assertEqual(len(cache), 0)
+        fetch(None, "SELECT * FROM orders")
+        self.assertEqual(len(cache), 1)
+
+
+class TestTableExtraction(unittest.TestCase):
+    """Test cases for tables_in_query and tables_written_by."""
+
+    def test_tables_in_query(self) -> None:
+        """Test that read and written tables are found without quoting or schema."""
+        cases = {
+            "SELECT * FROM users": {'users'},
+            "select * from main.\"Users\" u join orders o on o.user_id = u.id": {'users', 'orders'},
+            "SELECT * FROM a, b WHERE a.id IN (SELECT id FROM c)": {'a', 'b', 'c'},
+            "UPDATE OR IGNORE users SET name = 'from x'": {'users'},
+            "INSERT OR REPLACE INTO users (name) VALUES ('a')": {'users'},
+            "SELECT * FROM users -- from orders": {'users'},
+            "SELECT * FROM users /* join orders */ WHERE id = 1": {'users'},
+            "SELECT '-- from orders' FROM users": {'users'},
+            "SELECT * FROM [my table], \"other table\"": {'my table', 'other table'},
+            "UPDATE `order details` SET qty = 1": {'order details'},
+            "SELECT * FROM main.\"user, data\" WHERE 1": {'user, data'},
+            "SELECT 1": set(),
+        }
+        for sql, expected in cases.items():
+            with self.subTest(sql=sql):
+                self.assertEqual(tables_in_query(sql), frozenset(expected))
+
+    def test_tables_written_by(self) -> None:
+        """Test that writes are attributed to tables and unparseable ones are unknown."""
+        cases = {
+            "SELECT * FROM users": frozenset(),
+            "  -- comment\n/* block */ SELECT 1": frozenset(),
+            "WITH x AS (SELECT 1) SELECT * FROM x": frozenset(),
+            "PRAGMA journal_mode = WAL": frozenset(),
+            "COMMIT": frozenset(),
+            "DELETE FROM users WHERE id = 1": frozenset({'users'}),
+            "-- note\nINSERT INTO users VALUES (1)": frozenset({'users'}),
+            "/* insert into x */ SELECT * FROM users": frozenset(),
+            "WITH x AS (SELECT 'update') SELECT * FROM x": frozenset(),
+            "INSERT INTO [my table] VALUES (1)": frozenset({'my table'}),
+            "WITH x AS (SELECT 1) INSERT INTO users SELECT * FROM x": frozenset({'users', 'x'}),
+            "CREATE TABLE t (a)": None,
+            "VACUUM": None,
+        }
+        for sql, expected in cases.items():
+            with self.subTest(sql=sql):
+                self.assertEqual(tables_written_by(sql), expected)
+
+
+class TestCachingConnectionWrites(unittest.TestCase):
+    """Test cases for commit notifications from CachingConnection."""
+
+    def setUp(self) -> None:
+        """Open an in-memory database and collect notifications."""
+        self.written = []
+        listeners = patch('db_pool._write_listeners', [self.written.append])
+        listeners.start()
+        self.addCleanup(listeners.stop)
+        self.conn = sqlite3.connect(':memory:', factory=CachingConnection)
+        self.conn.execute("CREATE TABLE users (id INTEGER PRIMARY KEY, name TEXT)")
+        self.written.clear()
+
+    def tearDown(self) -> None:
+        """Close the database."""
+        self.conn.close()
+
+    def test_commit(self) -> None:
+        """Test that commit() reports the tables written."""
+        self.conn.execute("INSERT INTO users (name) VALUES ('a')")
+        self.assertEqual(self.written, [])
+        self.conn.commit()
+        self.assertEqual(self.written, [frozenset({'users'})])
+
+    def test_rollback(self) -> None:
+        """Test that rolled back writes are not reported."""
+        self.conn.execute("INSERT INTO users (name) VALUES ('a')")
+        self.conn.rollback()
+        self.conn.commit()
+        self.assertEqual(self.written, [])
+
+    def test_context_manager(self) -> None:
+        """Test that leaving a with block reports on success only."""
+        with self.conn:
+            self.conn.execute("UPDATE OR IGNORE users SET name = 'b'")
+        self.assertEqual(self.written, [frozenset({'users'})])
+        with self.assertRaises(KeyError):
+            with self.conn:
+                self.conn.execute("DELETE FROM users")
+                raise KeyError('abort')
+        self.assertEqual(len(self.written), 1)
+
+    def test_autocommit(self) -> None:
+        """Test that writes outside a transaction are reported immediately."""
+        self.conn.isolation_level = None
+        self.conn.execute("INSERT INTO users (name) VALUES ('a')")
+        self.assertEqual(self.written, [frozenset({'users'})])
+
+    def test_schema_change(self) -> None:
+        """Test that DDL reports unknown tables."""
+        self.conn.execute("CREATE TABLE orders (id INTEGER)")
+        self.assertEqual(self.written, [None])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""Unit tests for the per-fingerprint QueryStats in 0-log_queries."""
+
+import json
+import os
+import random
+import tempfile
+import unittest
+
+log_queries_module = __import__('0-log_queries')
+QueryStats = log_queries_module.QueryStats
+fingerprint_query = log_queries_module.fingerprint_query
+
+
+class TestFingerprintQuery(unittest.TestCase):
+    """Test cases for the fingerprint_query function."""
+
+    def test_literals_collapsed(self) -> None:
+        """Test that queries differing only in literals share a fingerprint."""
+        self.assertEqual(fingerprint_query("SELECT * FROM users WHERE id = 1"),
+                         fingerprint_query("select *  from users\nwhere id = 42"))
+        self.assertEqual(fingerprint_query("SELECT * FROM users WHERE name IN ('a', 'b', 'c')"),
+                         "select * from users where name in (?)")
+
+
+class TestQueryStatsEviction(unittest.TestCase):
+    """Test cases for the random-sample eviction in QueryStats."""
+
+    def test_table_stays_bounded(self) -> None:
+        """Test that the table never exceeds max_fingerprints and counts evictions."""
+        stats = QueryStats(max_fingerprints=10)
+        for table in range(50):
+            stats.record(f"SELECT * FROM t{table}", 1.0, 1)
+            self.assertLessEqual(len(stats.snapshot()), 10)
+        self.assertEqual(stats.evicted, 40)
+        # Every remaining entry still knows its slot in the sampling list
+        for key, entry in stats._entries.items():
+            self.assertEqual(stats._keys[entry['slot']], key)
+
+    def test_frequent_fingerprints_survive(self) -> None:
+        """Test that heavily used fingerprints outlive a stream of one-off queries."""
+        random.seed(0)
+        stats = QueryStats(max_fingerprints=10, eviction_sample=8)
+        for _ in range(100):
+            stats.record("SELECT * FROM hot WHERE id = 1", 1.0, 1)
+        for table in range(200):
+            stats.record(f"SELECT * FROM cold{table}", 1.0, 1)
+        fingerprints = {entry['fingerprint'] for entry in stats.snapshot()}
+        self.assertIn("select * from hot where id = ?", fingerprints)
+
+    def test_reset_clears_sampling_list(self) -> None:
+        """Test that reset and snapshot(reset=True) leave an empty, usable table."""
+        stats = QueryStats(max_fingerprints=2)
+        for table in range(3):
+            stats.record(f"SELECT * FROM t{table}", 1.0, 1)
+        stats.snapshot(reset=True)
+        self.assertEqual(stats._keys, [])
+        stats.reset()
+        self.assertEqual(stats.evicted, 0)
+        for table in range(3):
+            stats.record(f"SELECT * FROM t{table}", 1.0, 1)
+        self.assertEqual(len(stats.snapshot()), 2)
+
+
+class TestQueryStatsSnapshot(unittest.TestCase):
+    """Test cases for QueryStats snapshots and dumps."""
+
+    def setUp(self) -> None:
+        """Record a fast query three times and a slow one once."""
+        self.stats = QueryStats(window=512)
+        for duration in (1.0, 2.0, 3.0):
+            self.stats.record("SELECT * FROM users WHERE id = 7", duration, 1)
+        self.stats.record("SELECT * FROM orders", 50.0, 10, error=True)
+
+    def test_aggregates(self) -> None:
+        """Test the per-fingerprint aggregates, most total time first."""
+        slow, fast = self.stats.snapshot()
+        self.assertEqual(slow['fingerprint'], "select * from orders")
+        self.assertEqual((slow['calls'], slow['errors'], slow['rows']), (1, 1, 10))
+        self.assertEqual(fast['fingerprint'], "select * from users where id = ?")
+        self.assertEqual((fast['calls'], fast['errors'], fast['rows']), (3, 0, 3))
+        self.assertEqual(fast['total_ms'], 6.0)
+        self.assertEqual(fast['mean_ms'], 2.0)
+        self.assertEqual((fast['min_ms'], fast['max_ms'], fast['p95_ms']), (1.0, 3.0, 3.0))
+
+    def test_snapshot_reset(self) -> None:
+        """Test that snapshot(reset=True) returns the data and empties the table."""
+        self.assertEqual(len(self.stats.snapshot(reset=True)), 2)
+        self.assertEqual(self.stats.snapshot(), [])
+
+    def test_snapshot_is_a_copy(self) -> None:
+        """Test that later calls do not change an earlier snapshot."""
+        before = self.stats.snapshot()
+        self.stats.record("SELECT * FROM orders", 10.0, 1)
+        self.assertEqual(before[0]['calls'], 1)
+
+    def test_dump(self) -> None:
+        """Test that dump writes the snapshot and eviction count as JSON."""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'stats.json')
+            self.stats.dump(path)
+            with open(path, encoding='utf-8') as file:
+                data = json.load(file)
+        self.assertEqual(data['evicted'], 0)
+        self.assertEqual(data['queries'], self.stats.snapshot())
+        self.assertIn('timestamp', data)
+
+
+if __name__ == '__main__':
+    unittest.main()
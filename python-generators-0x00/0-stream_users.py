@@ -1,28 +1,51 @@
 #!/usr/bin/env python3
 from seed import connect_to_prodev
-from typing import Generator, Dict, Any
+from rows import check_row_format, format_rows
+from typing import Generator, Any
 
-def stream_users() -> Generator[Dict[str, Any], None, None]:
+def stream_users(buffered: bool = False, prefetch: int = 100,
+                 row_format: str = 'dict') -> Generator[Any, None, None]:
     """
     Generator function that fetches rows one by one from the user_data table.
     
+    By default the cursor is unbuffered, so rows stay on the server until they
+    are read and client memory is bounded by the prefetch window rather than
+    the size of the table.
+    
+    Args:
+        buffered (bool): Pull the whole result set into memory at execute() time
+        prefetch (int): Number of rows read from the server per fetchmany() call
+        row_format (str): 'dict', 'tuple' or 'record' (see rows.ROW_FORMATS)
+    
     Yields:
-        Dict[str, Any]: Each row as a dictionary with column names as keys
+        Any: Each row as a dictionary with column names as keys, a plain
+        tuple, or a __slots__ record, depending on row_format
     """
+    if prefetch <= 0:
+        raise ValueError("prefetch must be a positive integer")
+    check_row_format(row_format, allow_batch=False)
+    
     # Create database connection
     conn = connect_to_prodev()
+    exhausted = False
     
     try:
-        cursor = conn.cursor()
+        cursor = conn.cursor(buffered=buffered)
         cursor.execute("SELECT * FROM user_data")
+        columns = cursor.column_names
         
-        # Single loop to fetch and yield rows one by one
+        # Single loop to fetch a window of rows and yield them one by one
         while True:
-            row = cursor.fetchone()
-            if row is None:
+            rows = cursor.fetchmany(prefetch)
+            if not rows:
+                exhausted = True
                 break
-            yield dict(row)
+            yield from format_rows(rows, columns, row_format)
     
     finally:
-        conn.close()
-
+        if exhausted or buffered:
+            conn.close()
+        else:
+            # Unread rows would have to be drained before the connection could
+            # be reused, so drop it instead of returning it to the pool
+            conn.discard()
@@ -1,59 +1,252 @@
 #!/usr/bin/env python3
-from seed import connect_to_prodev
-from typing import Generator, List, Dict, Any
+import sys
+import time
+from seed import connect_to_prodev, USER_DATA_COLUMNS
+from rows import check_row_format, format_rows
+from typing import Callable, Generator, Iterable, List, Dict, Any, Optional, Sequence, Tuple, Union
 
-def stream_users_in_batches(batch_size: int) -> Generator[List[Dict[str, Any]], None, None]:
+# Comparison operators that can be pushed down into a WHERE clause
+SQL_OPERATORS = ('=', '!=', '<', '<=', '>', '>=')
+
+# A condition is either (column, operator, value), compiled into SQL, or a
+# callable taking a user dictionary, applied in Python
+Condition = Union[Tuple[str, str, Any], Callable[[Dict[str, Any]], bool]]
+
+
+def compile_conditions(conditions: Iterable[Condition]) -> Tuple[str, Tuple[Any, ...], List[Callable]]:
+    """
+    Split filter conditions into a parameterised WHERE clause and the
+    predicates that can only be evaluated in Python.
+    
+    Args:
+        conditions (Iterable[Condition]): (column, operator, value) tuples and/or callables
+    
+    Returns:
+        Tuple[str, Tuple[Any, ...], List[Callable]]: WHERE clause (empty if
+        nothing was pushed down), its parameters, and the remaining predicates
+    """
+    clauses = []
+    params = []
+    predicates = []
+    
+    for condition in conditions:
+        if callable(condition):
+            predicates.append(condition)
+            continue
+        
+        column, operator, value = condition
+        if column not in USER_DATA_COLUMNS:
+            raise ValueError(f"Unknown column in condition: {column}")
+        if operator not in SQL_OPERATORS:
+            raise ValueError(f"Unsupported operator in condition: {operator}")
+        
+        clauses.append(f"{column} {operator} %s")
+        params.append(value)
+    
+    where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+    return where, tuple(params), predicates
+
+
+def estimate_rows_bytes(rows: Sequence[Tuple[Any, ...]], sample: int = 32) -> int:
+    """
+    Approximate Python memory held by a batch of row tuples, extrapolated
+    from the first sample rows.
+    """
+    if not rows:
+        return 0
+    sampled = rows[:sample]
+    size = sum(sys.getsizeof(row) + sum(sys.getsizeof(value) for value in row) for row in sampled)
+    return size * len(rows) // len(sampled)
+
+
+class AdaptiveBatchSize:
+    """
+    Picks the next fetchmany() size from the batches seen so far.
+    
+    The per-row fetch time and per-row size are tracked as moving averages,
+    and the next size is the one expected to hit target_seconds and/or
+    target_bytes (the smaller of the two when both are set). Each step is
+    limited to a factor of max_step so a single slow batch cannot swing the
+    size wildly, and the size always stays within [min_size, max_size].
+    """
+
+    def __init__(self, initial: int, target_seconds: Optional[float] = None,
+                 target_bytes: Optional[int] = None, min_size: int = 10,
+                 max_size: int = 100000, max_step: float = 2.0, smoothing: float = 0.5):
+        if target_seconds is None and target_bytes is None:
+            raise ValueError("AdaptiveBatchSize needs target_seconds and/or target_bytes")
+        if not 0 < min_size <= max_size:
+            raise ValueError("min_size must be positive and no larger than max_size")
+        self.size = min(max(initial, min_size), max_size)
+        self.target_seconds = target_seconds
+        self.target_bytes = target_bytes
+        self.min_size = min_size
+        self.max_size = max_size
+        self.max_step = max_step
+        self.smoothing = smoothing
+        self.seconds_per_row: Optional[float] = None
+        self.bytes_per_row: Optional[float] = None
+
+    def _average(self, current: Optional[float], sample: float) -> float:
+        if current is None:
+            return sample
+        return self.smoothing * sample + (1 - self.smoothing) * current
+
+    def observe(self, rows: int, seconds: float, nbytes: int) -> int:
+        """
+        Record one fetched batch and choose the size of the next one.
+        
+        Args:
+            rows (int): Rows returned by the fetch
+            seconds (float): Time the fetch took
+            nbytes (int): Approximate size of the rows in memory
+        
+        Returns:
+            int: The next batch size
+        """
+        if rows <= 0:
+            return self.size
+        self.seconds_per_row = self._average(self.seconds_per_row, seconds / rows)
+        self.bytes_per_row = self._average(self.bytes_per_row, nbytes / rows)
+        
+        candidates = []
+        if self.target_seconds is not None and self.seconds_per_row > 0:
+            candidates.append(self.target_seconds / self.seconds_per_row)
+        if self.target_bytes is not None and self.bytes_per_row > 0:
+            candidates.append(self.target_bytes / self.bytes_per_row)
+        if not candidates:
+            return self.size
+        
+        wanted = min(candidates)
+        wanted = min(max(wanted, self.size / self.max_step), self.size * self.max_step)
+        self.size = int(min(max(wanted, self.min_size), self.max_size))
+        return self.size
+
+
+def stream_users_in_batches(batch_size: int, row_format: str = 'dict',
+                            conditions: Sequence[Condition] = (),
+                            target_seconds: Optional[float] = None,
+                            target_bytes: Optional[int] = None,
+                            stats: Optional[List[Dict[str, Any]]] = None) -> Generator[Any, None, None]:
     """
     Generator function that fetches rows in batches from the users database.
     
+    With target_seconds and/or target_bytes set, batch_size is only the first
+    fetchmany() size: later batches grow or shrink (see AdaptiveBatchSize)
+    toward the target fetch latency or in-memory batch size.
+    
     Args:
-        batch_size (int): Number of rows to fetch per batch
+        batch_size (int): Number of rows to fetch per batch (the initial size in adaptive mode)
+        row_format (str): 'dict', 'tuple' or 'record' rows, or a column-oriented
+            batch: 'columns', 'arrays' or 'numpy' (see rows.ROW_FORMATS)
+        conditions (Sequence[Condition]): (column, operator, value) filters
+            applied in SQL; callables are not accepted here, see batch_processing
+        target_seconds (Optional[float]): Adapt batch sizes toward this fetchmany() latency
+        target_bytes (Optional[int]): Adapt batch sizes toward this many bytes of rows per batch
+        stats (Optional[List[Dict[str, Any]]]): If given, a dict with batch,
+            batch_size (the size requested), rows, fetch_seconds and bytes is
+            appended for every batch fetched
     
     Yields:
-        List[Dict[str, Any]]: Each batch as a list of dictionaries
+        Any: Each batch as a list of dictionaries (or tuples/records), or as a
+        dict of column name to list/array of values for the batch formats
     """
+    check_row_format(row_format)
+    if batch_size <= 0:
+        raise ValueError("batch_size must be a positive integer")
+    where, params, predicates = compile_conditions(conditions)
+    if predicates:
+        raise ValueError("stream_users_in_batches only accepts SQL conditions")
+    
+    sizer = None
+    if target_seconds is not None or target_bytes is not None:
+        sizer = AdaptiveBatchSize(batch_size, target_seconds, target_bytes)
+        batch_size = sizer.size
+    
     # Create database connection
     conn = connect_to_prodev()
+    exhausted = False
     
     try:
         cursor = conn.cursor()
-        cursor.execute("SELECT * FROM users")
+        cursor.execute(f"SELECT * FROM user_data{where}", params)
+        columns = cursor.column_names
+        batch_number = 0
         
         # Loop 1: Fetch rows in batches
         while True:
+            fetch_start = time.perf_counter()
             rows = cursor.fetchmany(batch_size)
+            fetch_seconds = time.perf_counter() - fetch_start
             if not rows:
+                exhausted = True
                 break
             
-            # Convert rows to list of dictionaries
-            batch = [dict(row) for row in rows]
-            yield batch
+            if sizer is not None or stats is not None:
+                nbytes = estimate_rows_bytes(rows)
+                if stats is not None:
+                    stats.append({
+                        'batch': batch_number,
+                        'batch_size': batch_size,
+                        'rows': len(rows),
+                        'fetch_seconds': fetch_seconds,
+                        'bytes': nbytes,
+                    })
+                if sizer is not None:
+                    batch_size = sizer.observe(len(rows), fetch_seconds, nbytes)
+            batch_number += 1
+            
+            # Convert rows to the requested format
+            yield format_rows(rows, columns, row_format)
     
     finally:
-        conn.close()
+        if exhausted:
+            conn.close()
+        else:
+            # Abandoned part way: drop the connection rather than drain the
+            # unread rows so it could go back to the pool
+            conn.discard()
 
 
-def batch_processing(batch_size: int) -> Generator[List[Dict[str, Any]], None, None]:
+def batch_processing(batch_size: int, min_age: Optional[int] = 25,
+                     conditions: Sequence[Condition] = ()) -> Generator[List[Dict[str, Any]], None, None]:
     """
-    Process each batch to filter users over the age of 25.
+    Process each batch to filter users over the age of min_age.
+    
+    The age filter, and any (column, operator, value) conditions, are pushed
+    down into the query's WHERE clause so the database (using idx_age) only
+    sends matching rows. Callable conditions cannot be expressed in SQL and
+    are applied to each row in Python.
     
     Args:
         batch_size (int): Number of rows to process per batch
+        min_age (Optional[int]): Only users strictly older than this are kept; None disables the age filter
+        conditions (Sequence[Condition]): Extra filters, see compile_conditions
     
     Yields:
-        List[Dict[str, Any]]: Filtered batch containing only users over 25
+        List[Dict[str, Any]]: Filtered batch containing only matching users
     """
-    # Loop 2: Process each batch from the stream
-    for batch in stream_users_in_batches(batch_size):
-        filtered_users = []
-        
-        # Loop 3: Filter users in current batch
-        for user in batch:
-            if user.get('age', 0) > 25:
-                filtered_users.append(user)
-        
-        # Only yield batch if it contains filtered users
-        if filtered_users:
-            yield filtered_users
-
-
+    conditions = list(conditions)
+    if min_age is not None:
+        conditions.append(('age', '>', min_age))
+    
+    sql_conditions = [condition for condition in conditions if not callable(condition)]
+    predicates = [condition for condition in conditions if callable(condition)]
+    
+    batches = stream_users_in_batches(batch_size, conditions=sql_conditions)
+    try:
+        # Loop 2: Process each batch from the stream
+        for batch in batches:
+            if not predicates:
+                yield batch
+                continue
+            
+            # Loop 3: Filter users in current batch on what SQL could not express
+            filtered_users = [user for user in batch if all(predicate(user) for predicate in predicates)]
+            
+            # Only yield batch if it contains filtered users
+            if filtered_users:
+                yield filtered_users
+    finally:
+        # Release the connection now if this generator is abandoned early
+        batches.close()
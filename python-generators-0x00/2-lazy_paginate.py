@@ -1,59 +1,315 @@
 #!/usr/bin/env python3
-from seed import connect_to_prodev
-from typing import Generator, List, Dict, Any
+import base64
+import json
+import queue
+import threading
+import time
+from seed import connect_to_prodev, USER_DATA_COLUMNS
+from rows import check_row_format, format_rows
+from typing import Generator, Iterator, List, Dict, Any, Optional, Sequence, Tuple
 
-def paginate_users(page_size: int, offset: int) -> List[Dict[str, Any]]:
+# Statement text shared by every page so a prepared cursor only prepares it once
+PAGE_QUERY = "SELECT * FROM user_data LIMIT %s OFFSET %s"
+
+
+def fetch_page(cursor, page_size: int, offset: int) -> List[Tuple[Any, ...]]:
+    """
+    Fetch one page of users using an already open (prepared) cursor.
+    
+    Args:
+        cursor: Cursor created with conn.cursor(prepared=True)
+        page_size (int): Number of users to fetch per page
+        offset (int): Starting position for the page (0-indexed)
+    
+    Returns:
+        List[Tuple[Any, ...]]: Raw rows for the requested page, in cursor.column_names order
+    """
+    cursor.execute(PAGE_QUERY, (page_size, offset))
+    return cursor.fetchall()
+
+
+def paginate_users(page_size: int, offset: int, row_format: str = 'dict') -> Any:
     """
     Fetch a specific page of users from the database.
+    Opens and closes its own connection; use lazy_paginate to walk many pages.
     
     Args:
         page_size (int): Number of users to fetch per page
         offset (int): Starting position for the page (0-indexed)
+        row_format (str): 'dict' (default), 'tuple', 'record' or a batch
+            format such as 'columns' (see rows.ROW_FORMATS)
     
     Returns:
-        List[Dict[str, Any]]: List of users for the requested page
+        Any: List of users for the requested page, in row_format
     """
+    check_row_format(row_format)
+    
     # Create database connection
     conn = connect_to_prodev()
-    
+    cursor = None
     
     try:
-        cursor = conn.cursor()
-        cursor.execute("SELECT * FROM users LIMIT ? OFFSET ?", (page_size, offset))
-        rows = cursor.fetchall()
+        cursor = conn.cursor(prepared=True)
+        rows = fetch_page(cursor, page_size, offset)
         
-        # Convert rows to list of dictionaries
-        return [dict(row) for row in rows]
+        # Convert rows to the requested format
+        return format_rows(rows, cursor.column_names, row_format)
     
     finally:
+        # Deallocate the server-side statement before the connection is pooled
+        if cursor is not None:
+            cursor.close()
         conn.close()
 
 
-def lazy_paginate(page_size: int) -> Generator[List[Dict[str, Any]], None, None]:
+# Marks the end of the pages on a read-ahead queue
+_DONE = object()
+
+
+def read_ahead(pages: Iterator[Any], depth: int) -> Generator[Any, None, None]:
+    """
+    Generator that iterates pages on a background thread, keeping up to depth
+    items ready in a bounded queue so producing the next page overlaps with
+    the consumer's work on the current one.
+    
+    The iterator is created by the caller but advanced and closed only on the
+    background thread, so a connection it holds is never shared across threads.
+    
+    Args:
+        pages (Iterator[Any]): Iterator to run ahead of the consumer
+        depth (int): Maximum number of items fetched ahead
+    
+    Yields:
+        Any: Items of pages, in order
+    """
+    if depth <= 0:
+        raise ValueError("depth must be a positive integer")
+    
+    ready: queue.Queue = queue.Queue(maxsize=depth)
+    stop = threading.Event()
+    
+    def put(item) -> bool:
+        while not stop.is_set():
+            try:
+                ready.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+    
+    def produce() -> None:
+        try:
+            for item in pages:
+                if not put((item, None)):
+                    break
+        except Exception as e:
+            put((_DONE, e))
+        finally:
+            if hasattr(pages, 'close'):
+                pages.close()
+            put((_DONE, None))
+    
+    worker = threading.Thread(target=produce, daemon=True)
+    worker.start()
+    
+    try:
+        while True:
+            item, error = ready.get()
+            if error is not None:
+                raise error
+            if item is _DONE:
+                break
+            yield item
+    
+    finally:
+        stop.set()
+        worker.join()
+
+
+def lazy_paginate(page_size: int,
+                  stats: Optional[List[Dict[str, Any]]] = None,
+                  row_format: str = 'dict',
+                  prefetch: int = 0) -> Generator[Any, None, None]:
     """
     Generator function that lazily loads paginated data from the users database.
     Only fetches the next page when needed, starting at offset 0.
     
+    A single connection and server-side prepared statement are held for the
+    life of the generator instead of reconnecting for every page.
+    
     Args:
         page_size (int): Number of users to fetch per page
+        stats (Optional[List[Dict[str, Any]]]): If given, a dict with page, rows,
+            connect_seconds and fetch_seconds is appended for every page fetched.
+            connect_seconds is only non-zero for the first page.
+        row_format (str): 'dict' (default), 'tuple', 'record' or a batch
+            format such as 'columns' (see rows.ROW_FORMATS)
+        prefetch (int): If positive, fetch up to this many pages ahead on a
+            background thread (see read_ahead), so database time overlaps
+            with the consumer's time instead of adding to it
     
     Yields:
-        List[Dict[str, Any]]: Each page as a list of user dictionaries
+        Any: Each page as a list of user dictionaries (or in row_format)
     """
-    offset = 0
+    check_row_format(row_format)
+    if prefetch:
+        yield from read_ahead(lazy_paginate(page_size, stats, row_format), prefetch)
+        return
     
-    # Single loop to fetch pages lazily
-    while True:
-        # Fetch the current page
-        page_data = paginate_users(page_size, offset)
+    setup_start = time.perf_counter()
+    conn = connect_to_prodev()
+    cursor = None
+    
+    try:
+        cursor = conn.cursor(prepared=True)
+        connect_seconds = time.perf_counter() - setup_start
+        offset = 0
         
-        # If no data returned, we've reached the end
-        if not page_data:
-            break
+        # Single loop to fetch pages lazily
+        while True:
+            # Fetch the current page
+            fetch_start = time.perf_counter()
+            rows = fetch_page(cursor, page_size, offset)
+            
+            if stats is not None:
+                stats.append({
+                    'page': offset // page_size,
+                    'rows': len(rows),
+                    'connect_seconds': connect_seconds,
+                    'fetch_seconds': time.perf_counter() - fetch_start,
+                })
+            connect_seconds = 0.0
+            
+            # If no data returned, we've reached the end
+            if not rows:
+                break
+            
+            # Yield the current page
+            yield format_rows(rows, cursor.column_names, row_format)
+            
+            # Move to the next page
+            offset += page_size
+    
+    finally:
+        # Also reached when the consumer abandons the walk part way
+        if cursor is not None:
+            cursor.close()
+        conn.close()
+
+
+class Page(list):
+    """
+    A page of user dictionaries that also carries the cursor token needed to
+    resume pagination right after its last row.
+    """
+
+    def __init__(self, rows: List[Dict[str, Any]], next_cursor: Optional[str]):
+        super().__init__(rows)
+        self.next_cursor = next_cursor
+
+
+def encode_cursor(key: Sequence[Any]) -> str:
+    """
+    Encode a key tuple into an opaque, URL-safe cursor token.
+    
+    Args:
+        key (Sequence[Any]): Values of the order_by columns for the last row seen
+    
+    Returns:
+        str: Cursor token that can be passed back to keyset_paginate
+    """
+    payload = json.dumps(list(key), default=str, separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii')
+
+
+def decode_cursor(token: str) -> Tuple[Any, ...]:
+    """
+    Decode a cursor token produced by encode_cursor back into a key tuple.
+    
+    Args:
+        token (str): Cursor token
+    
+    Returns:
+        Tuple[Any, ...]: Values of the order_by columns to resume after
+    """
+    try:
+        payload = base64.urlsafe_b64decode(token.encode('ascii'))
+        key = json.loads(payload.decode('utf-8'))
+    except (ValueError, UnicodeError) as e:
+        raise ValueError(f"Invalid cursor token: {token!r}") from e
+    
+    if not isinstance(key, list):
+        raise ValueError(f"Invalid cursor token: {token!r}")
+    return tuple(key)
+
+
+def keyset_paginate(page_size: int,
+                    order_by: Sequence[str] = ("created_at", "user_id"),
+                    cursor: Optional[str] = None) -> Generator[Page, None, None]:
+    """
+    Generator function that pages through user_data using keyset (seek)
+    pagination instead of LIMIT/OFFSET.
+    
+    Each page is fetched with a WHERE (col1, col2, ...) > (last key) predicate
+    on an indexed key, so every page costs O(page_size) no matter how deep into
+    the table it is. The last column of order_by must be unique (user_id by
+    default) so that the key tuple identifies a single row.
+    
+    Args:
+        page_size (int): Number of users to fetch per page
+        order_by (Sequence[str]): Columns forming the sort/seek key
+        cursor (Optional[str]): Token from a previous Page.next_cursor to resume after
+    
+    Yields:
+        Page: Each page as a list of user dictionaries, with next_cursor set
+    """
+    if page_size <= 0:
+        raise ValueError("page_size must be a positive integer")
+    
+    order_by = tuple(order_by)
+    if not order_by:
+        raise ValueError("order_by must contain at least one column")
+    for column in order_by:
+        if column not in USER_DATA_COLUMNS:
+            raise ValueError(f"Unknown column in order_by: {column}")
+    
+    last_key = decode_cursor(cursor) if cursor is not None else None
+    if last_key is not None and len(last_key) != len(order_by):
+        raise ValueError("Cursor token does not match order_by columns")
+    
+    key_columns = ", ".join(order_by)
+    placeholders = ", ".join(["%s"] * len(order_by))
+    first_page_query = f"SELECT * FROM user_data ORDER BY {key_columns} LIMIT %s"
+    next_page_query = (
+        f"SELECT * FROM user_data WHERE ({key_columns}) > ({placeholders}) "
+        f"ORDER BY {key_columns} LIMIT %s"
+    )
+    
+    # One connection for the whole walk
+    conn = connect_to_prodev()
+    
+    try:
+        cursor_obj = conn.cursor(dictionary=True)
         
-        # Yield the current page
-        yield page_data
+        # Single loop to seek to each page after the last key seen
+        while True:
+            if last_key is None:
+                cursor_obj.execute(first_page_query, (page_size,))
+            else:
+                cursor_obj.execute(next_page_query, (*last_key, page_size))
+            rows = cursor_obj.fetchall()
+            
+            if not rows:
+                break
+            
+            last_key = tuple(rows[-1][column] for column in order_by)
+            yield Page(rows, encode_cursor(last_key))
+            
+            # A short page means we've reached the end
+            if len(rows) < page_size:
+                break
         
-        # Move to the next page
-        offset += page_size
-
+        cursor_obj.close()
+    
+    finally:
+        conn.close()
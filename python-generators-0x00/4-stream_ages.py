@@ -1,6 +1,8 @@
 #!/usr/bin/env python3
+import math
+from collections import Counter
 from seed import connect_to_prodev
-from typing import Generator
+from typing import Any, Dict, Generator, List, Optional, Sequence
 
 def stream_user_ages() -> Generator[int, None, None]:
     """
@@ -9,45 +11,224 @@ def stream_user_ages() -> Generator[int, None, None]:
     Yields:
         int: Each user's age
     """
+    for batch in stream_user_age_batches():
+        yield from batch
+
+
+def stream_user_age_batches(batch_size: int = 1000) -> Generator[List[int], None, None]:
+    """
+    Generator function that yields user ages in fetchmany() batches.
+    
+    Args:
+        batch_size (int): Number of ages to fetch per batch
+    
+    Yields:
+        List[int]: Each batch of ages
+    """
     # Create database connection
     conn = connect_to_prodev()
+    exhausted = False
     
     try:
         cursor = conn.cursor()
-        cursor.execute("SELECT age FROM users WHERE age IS NOT NULL")
+        cursor.execute("SELECT age FROM user_data WHERE age IS NOT NULL")
         
-        # Loop 1: Fetch and yield ages one by one
+        # Loop 1: Fetch and yield ages a batch at a time
         while True:
-            row = cursor.fetchone()
-            if row is None:
+            rows = cursor.fetchmany(batch_size)
+            if not rows:
+                exhausted = True
                 break
-            yield row[0]  # Yield the age value
+            # age is DECIMAL(3,0), so convert from Decimal
+            yield [int(row[0]) for row in rows]
+    
+    finally:
+        if exhausted:
+            conn.close()
+        else:
+            # Abandoned part way: drop the connection instead of draining the result
+            conn.discard()
+
+
+class AgeAccumulator:
+    """
+    Streaming accumulator for age statistics.
+    
+    Count, mean and variance are merged batch by batch with Welford's
+    algorithm (Chan et al.'s parallel form), and exact value counts are kept
+    for percentiles and histograms. Ages are small integers, so the counts
+    table stays tiny and, unlike a sketch such as t-digest, is exact.
+    """
+    
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = None
+        self.max = None
+        self.value_counts = Counter()
+    
+    def add_batch(self, values: Sequence[int]) -> None:
+        """
+        Fold a batch of ages into the running statistics.
+        
+        Args:
+            values (Sequence[int]): Ages in the batch
+        """
+        n = len(values)
+        if n == 0:
+            return
+        
+        batch_mean = sum(values) / n
+        batch_m2 = sum((value - batch_mean) ** 2 for value in values)
+        
+        # Merge the batch moments into the running ones
+        total = self.count + n
+        delta = batch_mean - self.mean
+        self.mean += delta * n / total
+        self.m2 += batch_m2 + delta * delta * self.count * n / total
+        self.count = total
+        
+        batch_min = min(values)
+        batch_max = max(values)
+        self.min = batch_min if self.min is None else min(self.min, batch_min)
+        self.max = batch_max if self.max is None else max(self.max, batch_max)
+        self.value_counts.update(values)
+    
+    def result(self, percentiles: Sequence[float] = (), bin_width: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Summarise everything seen so far.
+        
+        Args:
+            percentiles (Sequence[float]): Percentiles (0-100) to compute
+            bin_width (Optional[int]): Width of histogram buckets; None skips the histogram
+        
+        Returns:
+            Dict[str, Any]: See age_statistics
+        """
+        variance = self.m2 / self.count if self.count else 0.0
+        return build_result(self.count, self.mean if self.count else 0.0, self.min, self.max,
+                            variance, self.value_counts, percentiles, bin_width)
+
+
+def build_result(count: int, avg: float, minimum: Optional[int], maximum: Optional[int], variance: float,
+                 value_counts: Dict[int, int], percentiles: Sequence[float],
+                 bin_width: Optional[int]) -> Dict[str, Any]:
+    """
+    Assemble the statistics dictionary shared by the SQL and streaming paths.
+    Percentiles use the nearest-rank method over the exact value counts.
+    """
+    result = {
+        'count': count,
+        'avg': avg,
+        'min': minimum,
+        'max': maximum,
+        'variance': variance,
+        'stddev': math.sqrt(variance),
+    }
+    
+    if percentiles:
+        ordered = sorted(value_counts.items())
+        result['percentiles'] = {}
+        for percentile in percentiles:
+            if not 0 <= percentile <= 100:
+                raise ValueError(f"Percentile out of range: {percentile}")
+            if not count:
+                result['percentiles'][percentile] = None
+                continue
+            rank = max(1, math.ceil(percentile / 100 * count))
+            seen = 0
+            for value, value_count in ordered:
+                seen += value_count
+                if seen >= rank:
+                    result['percentiles'][percentile] = value
+                    break
+    
+    if bin_width is not None:
+        histogram = Counter()
+        for value, value_count in value_counts.items():
+            histogram[value // bin_width * bin_width] += value_count
+        result['histogram'] = dict(sorted(histogram.items()))
+    
+    return result
+
+
+def age_statistics(percentiles: Sequence[float] = (), bin_width: Optional[int] = None,
+                   in_database: bool = True, batch_size: int = 1000) -> Dict[str, Any]:
+    """
+    Compute age statistics for all users.
+    
+    With in_database=True the work is pushed into MySQL: one aggregate query
+    for count/avg/min/max/variance and, only when percentiles or a histogram
+    are requested, one GROUP BY age query returning at most one row per
+    distinct age. Otherwise ages are streamed in fetchmany() batches into an
+    AgeAccumulator.
+    
+    Args:
+        percentiles (Sequence[float]): Percentiles (0-100) to compute, e.g. (50, 90, 99)
+        bin_width (Optional[int]): Width of histogram buckets; None skips the histogram
+        in_database (bool): Aggregate in SQL instead of streaming
+        batch_size (int): Ages per batch when streaming
+    
+    Returns:
+        Dict[str, Any]: count, avg, min, max, variance and stddev, plus
+        percentiles ({percentile: age}) and histogram ({bucket start: count})
+        when requested
+    """
+    if bin_width is not None and bin_width <= 0:
+        raise ValueError("bin_width must be a positive integer")
+    
+    if not in_database:
+        accumulator = AgeAccumulator()
+        for batch in stream_user_age_batches(batch_size):
+            accumulator.add_batch(batch)
+        return accumulator.result(percentiles, bin_width)
+    
+    # Create database connection
+    conn = connect_to_prodev()
+    
+    try:
+        cursor = conn.cursor()
+        cursor.execute(
+            "SELECT COUNT(age), AVG(age), MIN(age), MAX(age), VAR_POP(age) FROM user_data"
+        )
+        count, avg, minimum, maximum, variance = cursor.fetchone()
+        
+        value_counts = {}
+        if percentiles or bin_width is not None:
+            cursor.execute(
+                "SELECT age, COUNT(*) FROM user_data WHERE age IS NOT NULL GROUP BY age"
+            )
+            value_counts = {int(age): age_count for age, age_count in cursor.fetchall()}
+        
+        cursor.close()
     
     finally:
         conn.close()
+    
+    return build_result(
+        count,
+        float(avg) if avg is not None else 0.0,
+        int(minimum) if minimum is not None else None,
+        int(maximum) if maximum is not None else None,
+        float(variance) if variance is not None else 0.0,
+        value_counts,
+        percentiles,
+        bin_width,
+    )
 
 
 def calculate_average_age() -> float:
     """
-    Calculate the average age of users using the generator.
-    Memory-efficient approach that doesn't load entire dataset.
+    Calculate the average age of users.
+    Runs as a single SELECT AVG(age) style query rather than pulling every
+    age over the wire; see age_statistics(in_database=False) for the
+    streaming version.
     
     Returns:
         float: Average age of all users
     """
-    total_age = 0
-    user_count = 0
-    
-    # Loop 2: Process each age from the generator
-    for age in stream_user_ages():
-        total_age += age
-        user_count += 1
-    
-    # Calculate and return average
-    if user_count == 0:
-        return 0.0
-    print
-    return total_age / user_count
+    return age_statistics()['avg']
 
 # Main execution
 if __name__ == "__main__":
@@ -56,4 +237,4 @@ if __name__ == "__main__":
     
     # Optional: Demonstrate the memory efficiency
     print(f"\nMemory-efficient calculation completed!")
-    print("Ages were processed one by one without loading entire dataset into memory.")
\ No newline at end of file
+    print("Ages were aggregated by the database without loading the dataset into memory.")
@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+import queue
+import threading
+from collections import Counter
+from seed import connect_to_prodev
+from rows import check_row_format, format_rows
+from typing import Any, Generator, List, Optional, Tuple
+
+# Marks the end of one partition's rows on a queue
+_DONE = object()
+
+
+class _PartitionError:
+    """
+    Carries an exception raised in a worker thread to the consuming generator.
+    """
+
+    def __init__(self, error: BaseException):
+        self.error = error
+
+
+def partition_bounds(partitions: int) -> List[Tuple[Optional[str], Optional[str]]]:
+    """
+    Split the user_id key space into contiguous ranges.
+    
+    user_id values are UUID strings, so the ranges are cut on two-character
+    hex prefixes. The first range has no lower bound and the last no upper
+    bound, so every key falls in exactly one range.
+    
+    Args:
+        partitions (int): Number of ranges (at most 256)
+    
+    Returns:
+        List[Tuple[Optional[str], Optional[str]]]: (lower inclusive, upper exclusive)
+        bounds in key order; None means unbounded
+    """
+    if not 1 <= partitions <= 256:
+        raise ValueError("partitions must be between 1 and 256")
+    
+    edges = [format(i * 256 // partitions, '02x') for i in range(1, partitions)]
+    return list(zip([None] + edges, edges + [None]))
+
+
+def _put(out: queue.Queue, item: Any, stop: threading.Event) -> bool:
+    """
+    Put an item on a bounded queue, giving up if the consumer has stopped.
+    
+    Returns:
+        bool: True if the item was queued
+    """
+    while not stop.is_set():
+        try:
+            out.put(item, timeout=0.1)
+            return True
+        except queue.Full:
+            continue
+    return False
+
+
+def scan_partition(bounds: Tuple[Optional[str], Optional[str]], batch_size: int, row_format: str,
+                   ordered: bool, out: queue.Queue, stop: threading.Event) -> None:
+    """
+    Worker that scans one user_id range on its own pooled connection and
+    puts batches of formatted rows on out, followed by _DONE.
+    
+    Args:
+        bounds (Tuple[Optional[str], Optional[str]]): Range from partition_bounds
+        batch_size (int): Rows per fetchmany() call and per queued batch
+        row_format (str): 'dict', 'tuple' or 'record'
+        ordered (bool): Sort the range by user_id
+        out (queue.Queue): Bounded queue the batches are put on
+        stop (threading.Event): Set by the consumer when it no longer wants rows
+    """
+    lower, upper = bounds
+    clauses = []
+    params = []
+    if lower is not None:
+        clauses.append("user_id >= %s")
+        params.append(lower)
+    if upper is not None:
+        clauses.append("user_id < %s")
+        params.append(upper)
+    where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+    order = " ORDER BY user_id" if ordered else ""
+    
+    conn = None
+    exhausted = False
+    
+    try:
+        conn = connect_to_prodev()
+        cursor = conn.cursor()
+        cursor.execute(f"SELECT * FROM user_data{where}{order}", tuple(params))
+        columns = cursor.column_names
+        
+        while not stop.is_set():
+            rows = cursor.fetchmany(batch_size)
+            if not rows:
+                exhausted = True
+                break
+            if not _put(out, format_rows(rows, columns, row_format), stop):
+                break
+    
+    except Exception as e:
+        _put(out, _PartitionError(e), stop)
+    
+    finally:
+        if conn is not None:
+            if exhausted:
+                conn.close()
+            else:
+                # Don't drain an abandoned result set just to reuse the connection
+                conn.discard()
+        _put(out, _DONE, stop)
+
+
+def parallel_stream_users(workers: int = 4, ordered: bool = False, batch_size: int = 1000,
+                          queue_size: int = 4, row_format: str = 'dict') -> Generator[Any, None, None]:
+    """
+    Generator function that streams the user_data table using several
+    connections at once.
+    
+    The table is split into workers user_id ranges (see partition_bounds),
+    each scanned by its own thread on a connection from the shared pool, so
+    MYSQL_POOL_SIZE should be at least workers. Workers hand batches over
+    bounded queues, so a slow consumer pauses them instead of letting rows
+    pile up in memory.
+    
+    Args:
+        workers (int): Number of ranges scanned in parallel
+        ordered (bool): Yield rows in user_id order; ranges are then drained
+            one after another while later ranges fill their queues
+        batch_size (int): Rows per fetchmany() call
+        queue_size (int): Batches each worker may have queued ahead of the consumer
+        row_format (str): 'dict', 'tuple' or 'record' (see rows.ROW_FORMATS)
+    
+    Yields:
+        Any: Each row, in the requested format
+    """
+    check_row_format(row_format, allow_batch=False)
+    if batch_size <= 0 or queue_size <= 0:
+        raise ValueError("batch_size and queue_size must be positive integers")
+    
+    bounds = partition_bounds(workers)
+    stop = threading.Event()
+    
+    if ordered:
+        queues = [queue.Queue(maxsize=queue_size) for _ in bounds]
+    else:
+        queues = [queue.Queue(maxsize=queue_size * len(bounds))] * len(bounds)
+    
+    threads = [
+        threading.Thread(
+            target=scan_partition,
+            args=(partition, batch_size, row_format, ordered, out, stop),
+            daemon=True,
+        )
+        for partition, out in zip(bounds, queues)
+    ]
+    for thread in threads:
+        thread.start()
+    
+    try:
+        # Ordered: one queue per range, drained in key order.
+        # Unordered: one shared queue, finished once every worker is done.
+        pending = Counter(queues)
+        
+        for out in pending:
+            while pending[out]:
+                item = out.get()
+                if item is _DONE:
+                    pending[out] -= 1
+                elif isinstance(item, _PartitionError):
+                    raise item.error
+                else:
+                    yield from item
+    
+    finally:
+        stop.set()
+        for thread in threads:
+            thread.join()
@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+import asyncio
+from seed import get_db_config
+from rows import check_row_format, format_rows
+from typing import Any, AsyncGenerator, Awaitable, Callable, List, Tuple
+
+try:
+    import aiomysql
+except ImportError:  # aiomysql is only needed for the async variants
+    aiomysql = None
+
+
+async def connect_async():
+    """
+    Opens an aiomysql connection to ALX_prodev using the same environment
+    configuration as seed.connect_to_prodev.
+    
+    Returns:
+        aiomysql.Connection: The open connection
+    """
+    if aiomysql is None:
+        raise ImportError("The async generators require aiomysql to be installed")
+    
+    config = get_db_config()
+    return await aiomysql.connect(
+        host=config['host'],
+        port=config['port'],
+        user=config['user'],
+        password=config['password'],
+        db=config['database'],
+    )
+
+
+async def prefetch_batches(fetch: Callable[[], Awaitable[List[Tuple[Any, ...]]]],
+                           prefetch: bool = True) -> AsyncGenerator[List[Tuple[Any, ...]], None]:
+    """
+    Async generator that calls fetch() until it returns no rows.
+    
+    With prefetch=True the next fetch is started before the current batch is
+    handed to the consumer, so the database round trip overlaps with whatever
+    the consumer awaits while processing it.
+    
+    Args:
+        fetch (Callable[[], Awaitable[List[Tuple[Any, ...]]]]): Coroutine function returning the next batch
+        prefetch (bool): Fetch one batch ahead of the consumer
+    
+    Yields:
+        List[Tuple[Any, ...]]: Each non-empty batch
+    """
+    if not prefetch:
+        while True:
+            rows = await fetch()
+            if not rows:
+                break
+            yield rows
+        return
+    
+    pending = asyncio.ensure_future(fetch())
+    try:
+        while True:
+            rows = await pending
+            if not rows:
+                break
+            pending = asyncio.ensure_future(fetch())
+            yield rows
+    finally:
+        if not pending.done():
+            pending.cancel()
+            try:
+                await pending
+            except (asyncio.CancelledError, Exception):
+                pass
+
+
+async def astream_users_in_batches(batch_size: int, row_format: str = 'dict',
+                                   prefetch: bool = True) -> AsyncGenerator[Any, None]:
+    """
+    Async generator that fetches rows in batches from the user_data table
+    through an unbuffered server-side cursor.
+    
+    Args:
+        batch_size (int): Number of rows to fetch per batch
+        row_format (str): One of rows.ROW_FORMATS
+        prefetch (bool): Fetch the next batch while the consumer handles this one
+    
+    Yields:
+        Any: Each batch in the requested format
+    """
+    check_row_format(row_format)
+    
+    conn = await connect_async()
+    
+    try:
+        cursor = await conn.cursor(aiomysql.SSCursor)
+        await cursor.execute("SELECT * FROM user_data")
+        columns = tuple(column[0] for column in cursor.description)
+        
+        async for rows in prefetch_batches(lambda: cursor.fetchmany(batch_size), prefetch):
+            yield format_rows(rows, columns, row_format)
+    
+    finally:
+        # Closing the socket also abandons any unread rows
+        conn.close()
+
+
+async def astream_users(prefetch: int = 100, row_format: str = 'dict') -> AsyncGenerator[Any, None]:
+    """
+    Async generator that yields rows one by one from the user_data table,
+    reading prefetch rows per round trip one window ahead of the consumer.
+    
+    Args:
+        prefetch (int): Number of rows read from the server per fetchmany() call
+        row_format (str): 'dict', 'tuple' or 'record' (see rows.ROW_FORMATS)
+    
+    Yields:
+        Any: Each row in the requested format
+    """
+    check_row_format(row_format, allow_batch=False)
+    if prefetch <= 0:
+        raise ValueError("prefetch must be a positive integer")
+    
+    async for batch in astream_users_in_batches(prefetch, row_format):
+        for row in batch:
+            yield row
+
+
+async def alazy_paginate(page_size: int, row_format: str = 'dict',
+                         prefetch: bool = True) -> AsyncGenerator[Any, None]:
+    """
+    Async generator that lazily loads pages of users, holding one connection
+    for its whole life and requesting page N+1 while page N is consumed.
+    
+    Args:
+        page_size (int): Number of users to fetch per page
+        row_format (str): One of rows.ROW_FORMATS
+        prefetch (bool): Fetch the next page while the consumer handles this one
+    
+    Yields:
+        Any: Each page in the requested format
+    """
+    check_row_format(row_format)
+    
+    conn = await connect_async()
+    offset = 0
+    columns: Tuple[str, ...] = ()
+    
+    async def fetch_page() -> List[Tuple[Any, ...]]:
+        nonlocal offset, columns
+        async with conn.cursor() as cursor:
+            await cursor.execute("SELECT * FROM user_data LIMIT %s OFFSET %s", (page_size, offset))
+            rows = await cursor.fetchall()
+            columns = tuple(column[0] for column in cursor.description)
+        offset += page_size
+        return rows
+    
+    try:
+        async for rows in prefetch_batches(fetch_page, prefetch):
+            yield format_rows(rows, columns, row_format)
+    
+    finally:
+        conn.close()
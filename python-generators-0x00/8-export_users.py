@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+import bz2
+import csv
+import gzip
+import json
+import lzma
+import os
+import time
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, Dict, Optional
+
+try:
+    import pyarrow
+    import pyarrow.ipc
+    import pyarrow.parquet
+except ImportError:  # pyarrow is only needed for the parquet and arrow formats
+    pyarrow = None
+
+from seed import USER_DATA_COLUMNS
+
+stream_users_in_batches = __import__('1-batch_processing').stream_users_in_batches
+
+EXPORT_FORMATS = ('csv', 'ndjson', 'parquet', 'arrow')
+
+# Compression for the text formats is applied to the whole file stream
+TEXT_COMPRESSION = {
+    None: open,
+    'gzip': gzip.open,
+    'bz2': bz2.open,
+    'xz': lzma.open,
+}
+COMPRESSION_SUFFIXES = {'.gz': 'gzip', '.bz2': 'bz2', '.xz': 'xz'}
+
+# Arrow type of each user_data column for Parquet/Arrow exports; anything
+# else is written as a string. Fixing the schema up front stops pyarrow from
+# inferring a different one (e.g. decimal128(2, 0) vs (3, 0)) per batch.
+ARROW_TYPES = {'age': 'int16', 'created_at': 'timestamp', 'updated_at': 'timestamp'}
+
+
+def json_default(value: Any) -> Any:
+    """
+    Convert values json cannot encode: DECIMAL columns become int (or float)
+    and timestamps become ISO 8601 strings.
+    """
+    if isinstance(value, Decimal):
+        return int(value) if value == value.to_integral_value() else float(value)
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def write_csv(file, batch_size: int) -> int:
+    """
+    Write user_data as CSV with a header row taken from the cursor's column
+    names (USER_DATA_COLUMNS for an empty table); returns the row count.
+    """
+    writer = csv.writer(file)
+    rows = 0
+    for batch in stream_users_in_batches(batch_size, row_format='columns'):
+        if not rows:
+            writer.writerow(batch.keys())
+        writer.writerows(zip(*batch.values()))
+        rows += len(next(iter(batch.values())))
+    if not rows:
+        writer.writerow(USER_DATA_COLUMNS)
+    return rows
+
+
+def write_ndjson(file, batch_size: int) -> int:
+    """
+    Write user_data as one JSON object per line; returns the row count.
+    """
+    encoder = json.JSONEncoder(default=json_default, separators=(',', ':'))
+    rows = 0
+    for batch in stream_users_in_batches(batch_size, row_format='dict'):
+        file.writelines(encoder.encode(row) + "\n" for row in batch)
+        rows += len(batch)
+    return rows
+
+
+def export_users(path: str, export_format: Optional[str] = None, compression: Optional[str] = None,
+                 batch_size: int = 10000) -> Dict[str, Any]:
+    """
+    Stream the user_data table straight into a file, one batch at a time, so
+    memory use is bounded by batch_size rather than the table size.
+    Columns are written in table order (seed.USER_DATA_COLUMNS).
+    
+    Args:
+        path (str): Output file
+        export_format (Optional[str]): 'csv', 'ndjson', 'parquet' or 'arrow' (Arrow IPC);
+            inferred from the file extension when None
+        compression (Optional[str]): 'gzip', 'bz2' or 'xz' for csv/ndjson (inferred
+            from a .gz/.bz2/.xz extension when None); a codec
+            such as 'snappy' or 'zstd' for parquet; 'lz4' or 'zstd' for arrow
+        batch_size (int): Rows read and written per batch
+    
+    Returns:
+        Dict[str, Any]: rows, bytes (size on disk), seconds and rows_per_sec
+    """
+    if export_format is None:
+        export_format = infer_format(path)
+    if compression is None and export_format in ('csv', 'ndjson'):
+        compression = COMPRESSION_SUFFIXES.get(os.path.splitext(path.lower())[1])
+    if export_format not in EXPORT_FORMATS:
+        raise ValueError(f"Unknown export format {export_format!r}, expected one of {EXPORT_FORMATS}")
+    if export_format in ('parquet', 'arrow') and pyarrow is None:
+        raise ImportError(f"Exporting to {export_format} requires pyarrow to be installed")
+    if export_format in ('csv', 'ndjson') and compression not in TEXT_COMPRESSION:
+        raise ValueError(f"Unsupported compression for {export_format}: {compression}")
+    
+    start = time.perf_counter()
+    
+    if export_format in ('csv', 'ndjson'):
+        opener = TEXT_COMPRESSION[compression]
+        writer = write_csv if export_format == 'csv' else write_ndjson
+        with opener(path, 'wt', newline='', encoding='utf-8') as file:
+            rows = writer(file, batch_size)
+    else:
+        rows = write_arrow(path, export_format, compression, batch_size)
+    
+    elapsed = time.perf_counter() - start
+    stats = {
+        'rows': rows,
+        'bytes': os.path.getsize(path),
+        'seconds': elapsed,
+        'rows_per_sec': rows / elapsed if elapsed else 0.0,
+    }
+    print(f"Exported {rows} rows to {path} ({export_format}): {stats['bytes']} bytes "
+          f"in {elapsed:.2f}s ({stats['rows_per_sec']:.0f} rows/sec)")
+    return stats
+
+
+def write_arrow(path: str, export_format: str, compression: Optional[str], batch_size: int) -> int:
+    """
+    Write column batches to Parquet (one row group per batch) or an Arrow IPC
+    file (one record batch per batch); returns the row count.
+    """
+    writer = None
+    schema = None
+    rows = 0
+    
+    def open_writer(schema):
+        if export_format == 'parquet':
+            return pyarrow.parquet.ParquetWriter(path, schema, compression=compression or 'snappy')
+        options = pyarrow.ipc.IpcWriteOptions(compression=compression)
+        return pyarrow.ipc.new_file(path, schema, options=options)
+    
+    try:
+        # 'arrays' packs age as int16 instead of Decimal
+        for batch in stream_users_in_batches(batch_size, row_format='arrays'):
+            if writer is None:
+                schema = arrow_schema(batch.keys())
+                writer = open_writer(schema)
+            table = pyarrow.Table.from_pydict(batch, schema=schema)
+            writer.write_table(table)
+            rows += table.num_rows
+        
+        if writer is None:
+            # Empty table: still produce a valid, correctly typed file
+            schema = arrow_schema(USER_DATA_COLUMNS)
+            writer = open_writer(schema)
+            writer.write_table(schema.empty_table())
+    
+    finally:
+        if writer is not None:
+            writer.close()
+    
+    return rows
+
+
+def arrow_schema(columns) -> 'pyarrow.Schema':
+    """
+    Fixed Arrow schema for the given user_data columns (see ARROW_TYPES).
+    """
+    types = {'int16': pyarrow.int16(), 'timestamp': pyarrow.timestamp('us')}
+    return pyarrow.schema([
+        (column, types.get(ARROW_TYPES.get(column), pyarrow.string()))
+        for column in columns
+    ])
+
+
+def infer_format(path: str) -> str:
+    """
+    Guess the export format from a file name such as users.csv.gz.
+    """
+    name = path.lower()
+    for suffix in COMPRESSION_SUFFIXES:
+        if name.endswith(suffix):
+            name = name[:-len(suffix)]
+    extensions = {'.csv': 'csv', '.ndjson': 'ndjson', '.jsonl': 'ndjson',
+                  '.parquet': 'parquet', '.arrow': 'arrow', '.feather': 'arrow'}
+    for extension, export_format in extensions.items():
+        if name.endswith(extension):
+            return export_format
+    raise ValueError(f"Cannot infer export format from {path!r}")
+
+
+# Main execution
+if __name__ == "__main__":
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="Export the user_data table to a file")
+    parser.add_argument('path', help="output file, e.g. users.csv.gz or users.parquet")
+    parser.add_argument('--format', dest='export_format', choices=EXPORT_FORMATS)
+    parser.add_argument('--compression')
+    parser.add_argument('--batch-size', type=int, default=10000)
+    args = parser.parse_args()
+    
+    export_users(args.path, args.export_format, args.compression, args.batch_size)
@@ -0,0 +1,396 @@
+#!/usr/bin/env python3
+import hashlib
+import json
+import mmap
+import os
+import shutil
+import struct
+import sys
+import tempfile
+import time
+from array import array
+from datetime import datetime, timedelta
+from seed import connect_to_prodev, USER_DATA_COLUMNS
+from rows import check_row_format, format_rows
+from typing import Any, Generator, Optional, Tuple
+
+stream_users = __import__('0-stream_users').stream_users
+
+SNAPSHOT_QUERY = "SELECT * FROM user_data"
+# updated_at has one-second resolution, so a write in the same second as
+# the current maximum leaves the watermark unchanged; the third column says
+# whether that second is far enough in the past to trust (see settle_seconds)
+WATERMARK_QUERY = """
+SELECT MAX(updated_at), COUNT(*),
+       COALESCE(MAX(updated_at) < NOW() - INTERVAL %s SECOND, 1)
+FROM user_data
+"""
+
+MAGIC = b'USNAP01\0'
+HEADER = struct.Struct('=8sQ')
+
+# Per-build spool directories in the cache directory, so evict() can find crashed ones
+SPOOL_PREFIX = 'spool-'
+
+# How each user_data column is laid out on disk: strings as a uint64 offsets
+# array plus a UTF-8 blob, age as int16 and timestamps as int64 microseconds
+COLUMN_KINDS = {
+    'user_id': 'str',
+    'name': 'str',
+    'email': 'str',
+    'age': 'int16',
+    'created_at': 'timestamp',
+    'updated_at': 'timestamp',
+}
+TYPECODES = {'int16': 'h', 'timestamp': 'q', 'offsets': 'Q'}
+
+EPOCH = datetime(1970, 1, 1)
+MICROSECOND = timedelta(microseconds=1)
+NULL_TIMESTAMP = -2 ** 63
+
+
+def _align(size: int) -> int:
+    """
+    Round up to a multiple of 8 so every section can be cast in place.
+    """
+    return (size + 7) & ~7
+
+
+class Snapshot:
+    """
+    Read-only, memory-mapped snapshot of one scan of user_data.
+    
+    Fixed-width columns are exposed as memoryviews over the mapping, so
+    reading them copies nothing until a value is used. Call close() (or use
+    it as a context manager) once all views from column() have been released.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, 'rb')
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._views = []
+        
+        magic, metadata_length = HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC:
+            self.close()
+            raise ValueError(f"Not a user_data snapshot: {path}")
+        self.metadata = json.loads(self._map[HEADER.size:HEADER.size + metadata_length])
+        self.rows = self.metadata['rows']
+        self.columns = tuple(self.metadata['columns'])
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+        return False
+
+    def _section(self, name: str, typecode: Optional[str] = None) -> memoryview:
+        offset, length = self.metadata['sections'][name]
+        view = memoryview(self._map)[offset:offset + length]
+        if typecode is not None:
+            view = view.cast(typecode)
+        self._views.append(view)
+        return view
+
+    def column(self, name: str) -> memoryview:
+        """
+        Zero-copy view of a fixed-width column (age, created_at, updated_at).
+        Timestamps are int64 microseconds since 1970-01-01.
+        
+        Args:
+            name (str): Column name
+        
+        Returns:
+            memoryview: Typed view over the mapped file
+        """
+        kind = COLUMN_KINDS[name]
+        if kind == 'str':
+            raise ValueError(f"Column {name} is variable width; use iter_rows()")
+        return self._section(name, TYPECODES[kind])
+
+    def iter_rows(self, batch_size: int = 1000) -> Generator[list, None, None]:
+        """
+        Generator of row tuples decoded from the mapping, a batch at a time.
+        
+        Args:
+            batch_size (int): Rows decoded per batch
+        
+        Yields:
+            list: Batches of row tuples in self.columns order
+        """
+        decoders = []
+        for name in self.columns:
+            kind = COLUMN_KINDS[name]
+            if kind == 'str':
+                offsets = self._section(f"{name}.offsets", TYPECODES['offsets'])
+                data = self._section(f"{name}.data")
+                decoders.append(lambda i, offsets=offsets, data=data:
+                                str(data[offsets[i]:offsets[i + 1]], 'utf-8'))
+            elif kind == 'timestamp':
+                values = self.column(name)
+                decoders.append(lambda i, values=values:
+                                None if values[i] == NULL_TIMESTAMP else EPOCH + values[i] * MICROSECOND)
+            else:
+                decoders.append(self.column(name).__getitem__)
+        
+        for start in range(0, self.rows, batch_size):
+            stop = min(start + batch_size, self.rows)
+            yield [tuple(decode(i) for decode in decoders) for i in range(start, stop)]
+
+    def close(self) -> None:
+        """
+        Release every view handed out and unmap the file.
+        """
+        for view in reversed(self._views):
+            view.release()
+        self._views = []
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        self._file.close()
+
+
+class SnapshotCache:
+    """
+    Directory of memory-mapped user_data snapshots.
+    
+    A snapshot is keyed by its query text and the table watermark
+    (MAX(updated_at) and COUNT(*)), so any insert, update or delete makes
+    the next lookup build a fresh one. Snapshots older than max_age seconds
+    are rebuilt as well.
+    
+    While the newest change is less than settle_seconds old, another write
+    could still land in the same updated_at second without moving the
+    watermark (the same reason stream_user_changes holds recent rows back).
+    Snapshots taken then are private to the caller and never cached.
+    """
+
+    def __init__(self, cache_dir: str = '.snapshot_cache', max_age: float = 3600.0,
+                 settle_seconds: int = 2):
+        self.cache_dir = cache_dir
+        self.max_age = max_age
+        self.settle_seconds = settle_seconds
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def current_watermark(self) -> Tuple[str, bool]:
+        """
+        Ask the database for the current table watermark.
+        
+        Returns:
+            Tuple[str, bool]: "<max updated_at>|<row count>", and whether the
+            newest change is older than settle_seconds
+        """
+        conn = connect_to_prodev()
+        try:
+            cursor = conn.cursor()
+            cursor.execute(WATERMARK_QUERY, (self.settle_seconds,))
+            max_updated_at, count, settled = cursor.fetchone()
+            cursor.close()
+        finally:
+            conn.close()
+        return f"{max_updated_at}|{count}", bool(settled)
+
+    def path_for(self, query: str, watermark: str) -> str:
+        """
+        File path of the snapshot for a query at a watermark.
+        """
+        key = hashlib.sha256(f"{query}\0{watermark}\0{sys.byteorder}".encode('utf-8')).hexdigest()
+        return os.path.join(self.cache_dir, f"{key[:32]}.snap")
+
+    def snapshot(self) -> Snapshot:
+        """
+        Open the snapshot matching the current watermark, materialising it
+        from MySQL first if it is missing or expired.
+        
+        Returns:
+            Snapshot: The open snapshot; close it when done
+        """
+        watermark, settled = self.current_watermark()
+        if not settled:
+            # Build a throwaway snapshot; the mapping outlives the unlinked file
+            path = self.materialise(None, watermark)
+            try:
+                return Snapshot(path)
+            finally:
+                os.remove(path)
+        
+        path = self.path_for(SNAPSHOT_QUERY, watermark)
+        
+        try:
+            fresh = time.time() - os.path.getmtime(path) <= self.max_age
+        except OSError:
+            fresh = False
+        
+        if not fresh:
+            self.materialise(path, watermark)
+            self.evict(keep=path)
+        return Snapshot(path)
+
+    def materialise(self, path: Optional[str], watermark: str, batch_size: int = 10000) -> str:
+        """
+        Scan user_data once with stream_users and write it as a snapshot file.
+        Each column is spooled to its own temporary file so memory stays
+        bounded by batch_size; the sections are then concatenated into a
+        uniquely named temporary file, which is renamed into place atomically.
+        
+        Args:
+            path (Optional[str]): Destination snapshot file; None leaves the
+                result under its temporary name
+            watermark (str): Watermark recorded in the snapshot metadata
+            batch_size (int): Rows buffered per column before spooling
+        
+        Returns:
+            str: Path of the written snapshot
+        """
+        with tempfile.TemporaryDirectory(prefix=SPOOL_PREFIX, dir=self.cache_dir) as spool_dir:
+            spools = {}
+            string_sizes = {}
+            for name in USER_DATA_COLUMNS:
+                if COLUMN_KINDS[name] == 'str':
+                    spools[f"{name}.offsets"] = open(os.path.join(spool_dir, f"{name}.offsets"), 'wb')
+                    spools[f"{name}.data"] = open(os.path.join(spool_dir, f"{name}.data"), 'wb')
+                    array(TYPECODES['offsets'], [0]).tofile(spools[f"{name}.offsets"])
+                    string_sizes[name] = 0
+                else:
+                    spools[name] = open(os.path.join(spool_dir, name), 'wb')
+            
+            rows = 0
+            batch = []
+
+            def flush():
+                for index, name in enumerate(USER_DATA_COLUMNS):
+                    values = [row[index] for row in batch]
+                    kind = COLUMN_KINDS[name]
+                    if kind == 'str':
+                        encoded = [value.encode('utf-8') for value in values]
+                        offsets = array(TYPECODES['offsets'])
+                        for value in encoded:
+                            string_sizes[name] += len(value)
+                            offsets.append(string_sizes[name])
+                        offsets.tofile(spools[f"{name}.offsets"])
+                        spools[f"{name}.data"].write(b''.join(encoded))
+                    elif kind == 'timestamp':
+                        array(TYPECODES[kind], [
+                            NULL_TIMESTAMP if value is None else (value - EPOCH) // MICROSECOND
+                            for value in values
+                        ]).tofile(spools[name])
+                    else:
+                        array(TYPECODES[kind], map(int, values)).tofile(spools[name])
+                batch.clear()
+            
+            try:
+                for row in stream_users(row_format='tuple', prefetch=1000):
+                    batch.append(row)
+                    rows += 1
+                    if len(batch) >= batch_size:
+                        flush()
+                flush()
+            finally:
+                for spool in spools.values():
+                    spool.close()
+            
+            # Lay the sections out after the header and metadata
+            metadata = {
+                'query': SNAPSHOT_QUERY,
+                'watermark': watermark,
+                'rows': rows,
+                'columns': list(USER_DATA_COLUMNS),
+                'byteorder': sys.byteorder,
+                'sections': {},
+            }
+            placeholder = json.dumps(metadata).encode('utf-8')
+            # Reserve room for the section table before its offsets are known
+            metadata_room = _align(len(placeholder) + 64 * len(spools) + 64)
+            offset = HEADER.size + metadata_room
+            for name in spools:
+                size = os.path.getsize(os.path.join(spool_dir, name))
+                metadata['sections'][name] = [offset, size]
+                offset += _align(size)
+            
+            encoded = json.dumps(metadata).encode('utf-8')
+            if len(encoded) > metadata_room:
+                raise RuntimeError("Snapshot metadata larger than reserved space")
+            
+            # A unique name, so concurrent builds never write the same file
+            fd, temp_path = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+            try:
+                with os.fdopen(fd, 'wb') as out:
+                    out.write(HEADER.pack(MAGIC, len(encoded)))
+                    out.write(encoded.ljust(metadata_room, b' '))
+                    for name in spools:
+                        with open(os.path.join(spool_dir, name), 'rb') as spool:
+                            shutil.copyfileobj(spool, out)
+                        out.write(b'\0' * (_align(out.tell()) - out.tell()))
+                if path is None:
+                    return temp_path
+                os.replace(temp_path, path)
+            except BaseException:
+                if os.path.exists(temp_path):
+                    os.remove(temp_path)
+                raise
+            return path
+
+    def evict(self, keep: str) -> None:
+        """
+        Delete snapshots, leftover temporary files and spool directories
+        (left behind when a build crashed) older than max_age, except keep.
+        Younger files may belong to a concurrent job about to open them, so
+        they are left alone. Open snapshots stay readable until closed, as
+        their mapping outlives the name.
+        """
+        cutoff = time.time() - self.max_age
+        for name in os.listdir(self.cache_dir):
+            path = os.path.join(self.cache_dir, name)
+            if path == keep:
+                continue
+            try:
+                if name.startswith(SPOOL_PREFIX) and os.path.isdir(path):
+                    # A running build keeps writing its spool files, so judge by the newest
+                    spools = [os.path.join(path, spool) for spool in os.listdir(path)]
+                    if max(map(os.path.getmtime, [path] + spools)) < cutoff:
+                        shutil.rmtree(path, ignore_errors=True)
+                elif name.endswith(('.snap', '.tmp')) and os.path.getmtime(path) < cutoff:
+                    os.remove(path)
+            except OSError:
+                pass
+
+
+def cached_stream_users(cache: Optional[SnapshotCache] = None, row_format: str = 'dict',
+                        batch_size: int = 1000) -> Generator[Any, None, None]:
+    """
+    Generator function like stream_users, served from a local snapshot
+    instead of MySQL whenever the table has not changed.
+    
+    Args:
+        cache (Optional[SnapshotCache]): Cache to use; defaults to .snapshot_cache
+        row_format (str): 'dict', 'tuple' or 'record' (see rows.ROW_FORMATS)
+        batch_size (int): Rows decoded from the mapping at a time
+    
+    Yields:
+        Any: Each row in the requested format
+    """
+    check_row_format(row_format, allow_batch=False)
+    cache = cache or SnapshotCache()
+    
+    with cache.snapshot() as snapshot:
+        for batch in snapshot.iter_rows(batch_size):
+            yield from format_rows(batch, snapshot.columns, row_format)
+
+
+def cached_stream_user_ages(cache: Optional[SnapshotCache] = None) -> Generator[int, None, None]:
+    """
+    Generator function like stream_user_ages, reading ages straight out of
+    the snapshot's memory-mapped int16 column.
+    
+    Args:
+        cache (Optional[SnapshotCache]): Cache to use; defaults to .snapshot_cache
+    
+    Yields:
+        int: Each user's age
+    """
+    cache = cache or SnapshotCache()
+    
+    with cache.snapshot() as snapshot:
+        yield from snapshot.column('age')
@@ -0,0 +1,626 @@
+#!/usr/bin/env python3
+"""
+Benchmarks for the generators in python-generators-0x00.
+Run against a populated ALX_prodev.user_data table, for example:
+
+    python3 benchmark.py pagination --page-size 1000 --max-rows 1000000
+
+The suite subcommand seeds its own database instead and writes a JSON report:
+
+    python3 benchmark.py suite --sizes 10000,1000000 --output report.json
+"""
+
+import argparse
+import asyncio
+import csv
+import json
+import math
+import multiprocessing
+import os
+import platform
+import queue
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+import uuid
+from datetime import datetime, timezone
+from decimal import Decimal
+from typing import Callable, Dict, Any, Iterable, List, Optional, Sequence, Tuple
+
+from rows import ROW_FORMATS, format_rows, numpy
+import seed
+from seed import USER_DATA_COLUMNS
+
+stream_users_module = __import__('0-stream_users')
+batch_processing_module = __import__('1-batch_processing')
+lazy_paginate_module = __import__('2-lazy_paginate')
+stream_ages_module = __import__('4-stream_ages')
+parallel_stream_users_module = __import__('5-parallel_stream_users')
+async_streams_module = __import__('6-async_streams')
+
+# Fixed seed for the synthetic CSV, so every run loads identical names, emails and ages
+SUITE_RANDOM_SEED = 0x0A1B
+SUITE_DATABASE = 'ALX_bench'
+
+
+def current_rss_bytes() -> int:
+    """
+    Current resident set size of this process in bytes.
+    Reads /proc/self/statm on Linux and falls back to peak RSS elsewhere.
+    """
+    try:
+        with open('/proc/self/statm') as statm:
+            return int(statm.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError):
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # ru_maxrss is in bytes on macOS and kilobytes elsewhere
+        return peak if sys.platform == 'darwin' else peak * 1024
+
+
+def peak_rss_bytes() -> int:
+    """
+    Peak resident set size of this process in bytes.
+    """
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and kilobytes elsewhere
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+
+def percentile(values: Sequence[float], fraction: float) -> float:
+    """
+    Nearest-rank percentile of values (0.0 for an empty sequence).
+    """
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, math.ceil(fraction * len(ordered)))
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+def time_pages(pages: Iterable[List[Any]], max_rows: int) -> Dict[str, Any]:
+    """
+    Consume a page generator and time each page.
+    
+    Args:
+        pages (Iterable[List[Any]]): Generator yielding pages of rows
+        max_rows (int): Stop once this many rows have been consumed
+    
+    Returns:
+        Dict[str, Any]: Row count, total seconds and per-page latencies
+    """
+    latencies = []
+    rows = 0
+    start = time.perf_counter()
+    page_start = start
+    
+    for page in pages:
+        now = time.perf_counter()
+        latencies.append(now - page_start)
+        rows += len(page)
+        if rows >= max_rows:
+            break
+        page_start = time.perf_counter()
+    
+    total = time.perf_counter() - start
+    if hasattr(pages, 'close'):
+        pages.close()
+    
+    return {'rows': rows, 'seconds': total, 'latencies': latencies}
+
+
+def bench_pagination(page_size: int, max_rows: int) -> None:
+    """
+    Compare LIMIT/OFFSET lazy_paginate against keyset_paginate.
+    
+    Args:
+        page_size (int): Number of users per page
+        max_rows (int): Number of rows to walk with each strategy
+    """
+    strategies = {
+        'lazy_paginate (OFFSET)': lambda: lazy_paginate_module.lazy_paginate(page_size),
+        'keyset_paginate': lambda: lazy_paginate_module.keyset_paginate(page_size),
+    }
+    
+    print(f"Pagination benchmark: page_size={page_size}, max_rows={max_rows}")
+    print(f"{'Strategy':<24} | {'Rows':>9} | {'Seconds':>9} | {'Rows/s':>10} | {'First page ms':>13} | {'Last page ms':>12}")
+    print("-" * 92)
+    
+    for name, make_pages in strategies.items():
+        result = time_pages(make_pages(), max_rows)
+        latencies = result['latencies'] or [0.0]
+        rate = result['rows'] / result['seconds'] if result['seconds'] else 0.0
+        print(f"{name:<24} | {result['rows']:>9} | {result['seconds']:>9.2f} | {rate:>10.0f} | "
+              f"{latencies[0] * 1000:>13.2f} | {latencies[-1] * 1000:>12.2f}")
+
+
+def bench_connections(page_size: int, pages: int) -> None:
+    """
+    Compare a connection per page (paginate_users) against the single held
+    connection of lazy_paginate, splitting connection setup from fetch time.
+    
+    Args:
+        page_size (int): Number of users per page
+        pages (int): Number of pages to fetch with each strategy
+    """
+    print(f"Connection reuse benchmark: page_size={page_size}, pages={pages}")
+    
+    start = time.perf_counter()
+    for page in range(pages):
+        if not lazy_paginate_module.paginate_users(page_size, page * page_size):
+            break
+    per_page_seconds = time.perf_counter() - start
+    print(f"paginate_users (connect per page): {per_page_seconds:.2f}s total")
+    
+    stats: List[Dict[str, Any]] = []
+    start = time.perf_counter()
+    for page_number, _ in enumerate(lazy_paginate_module.lazy_paginate(page_size, stats=stats), start=1):
+        if page_number >= pages:
+            break
+    held_seconds = time.perf_counter() - start
+    
+    connect_seconds = sum(entry['connect_seconds'] for entry in stats)
+    fetch_seconds = sum(entry['fetch_seconds'] for entry in stats)
+    print(f"lazy_paginate (held connection):   {held_seconds:.2f}s total, "
+          f"{connect_seconds * 1000:.2f} ms connecting, {fetch_seconds * 1000:.2f} ms fetching "
+          f"over {len(stats)} pages")
+
+
+def bench_memory(max_rows: int, prefetch: int, buffered: bool, samples: int) -> None:
+    """
+    Stream rows with stream_users and sample RSS at regular intervals to show
+    whether memory stays flat as the row count grows.
+    
+    Args:
+        max_rows (int): Number of rows to stream
+        prefetch (int): fetchmany() window passed to stream_users
+        buffered (bool): Use a buffered cursor instead of the default unbuffered one
+        samples (int): Number of RSS samples to print
+    """
+    interval = max(1, max_rows // samples)
+    print(f"Memory benchmark: max_rows={max_rows}, prefetch={prefetch}, buffered={buffered}")
+    print(f"{'Rows':>12} | {'RSS MiB':>9} | {'Rows/s':>10}")
+    print("-" * 38)
+    
+    baseline = current_rss_bytes()
+    start = time.perf_counter()
+    rows = 0
+    users = stream_users_module.stream_users(buffered=buffered, prefetch=prefetch)
+    
+    for _ in users:
+        rows += 1
+        if rows % interval == 0:
+            elapsed = time.perf_counter() - start
+            print(f"{rows:>12} | {current_rss_bytes() / 2 ** 20:>9.1f} | {rows / elapsed:>10.0f}")
+        if rows >= max_rows:
+            break
+    users.close()
+    
+    growth = (current_rss_bytes() - baseline) / 2 ** 20
+    print(f"Streamed {rows} rows, RSS growth {growth:.1f} MiB")
+
+
+def bench_row_formats(rows: int, batch_size: int, repeat: int) -> None:
+    """
+    Measure the per-row cost of each row format on synthetic user_data rows.
+    No database is needed; this isolates conversion cost from fetch cost.
+    
+    Args:
+        rows (int): Number of synthetic rows to convert per run
+        batch_size (int): Rows per format_rows() call, as a fetchmany() window would be
+        repeat (int): Runs per format; the fastest is reported
+    """
+    now = datetime.now()
+    data = [
+        (str(uuid.uuid4()), f"User {i}", f"user{i}@example.com", Decimal(18 + i % 60), now, now)
+        for i in range(rows)
+    ]
+    batches = [data[i:i + batch_size] for i in range(0, rows, batch_size)]
+    
+    print(f"Row format benchmark: rows={rows}, batch_size={batch_size}, best of {repeat}")
+    print(f"{'Format':<8} | {'ns/row':>8} | {'Rows/s':>12}")
+    print("-" * 34)
+    
+    for row_format in ROW_FORMATS:
+        if row_format == 'numpy' and numpy is None:
+            continue
+        best = float('inf')
+        for _ in range(repeat):
+            start = time.perf_counter()
+            for batch in batches:
+                format_rows(batch, USER_DATA_COLUMNS, row_format)
+            best = min(best, time.perf_counter() - start)
+        print(f"{row_format:<8} | {best / rows * 1e9:>8.1f} | {rows / best:>12.0f}")
+
+
+def bench_async_overlap(batch_size: int, max_batches: int, work_ms: float) -> None:
+    """
+    Measure how much astream_users_in_batches gains from prefetching the
+    next batch while the consumer awaits simulated per-batch work.
+    
+    Args:
+        batch_size (int): Rows per batch
+        max_batches (int): Number of batches consumed per run
+        work_ms (float): Simulated consumer time per batch in milliseconds
+    """
+    async def consume(prefetch: bool) -> float:
+        start = time.perf_counter()
+        batches = async_streams_module.astream_users_in_batches(batch_size, row_format='tuple', prefetch=prefetch)
+        count = 0
+        async for _ in batches:
+            await asyncio.sleep(work_ms / 1000)
+            count += 1
+            if count >= max_batches:
+                break
+        await batches.aclose()
+        return time.perf_counter() - start
+    
+    print(f"Async overlap benchmark: batch_size={batch_size}, batches={max_batches}, work={work_ms} ms/batch")
+    sequential = asyncio.run(consume(prefetch=False))
+    overlapped = asyncio.run(consume(prefetch=True))
+    print(f"Without prefetch: {sequential:.2f}s")
+    print(f"With prefetch:    {overlapped:.2f}s ({sequential / overlapped if overlapped else 0:.2f}x)")
+
+
+def write_seed_csv(path: str, rows: int) -> None:
+    """
+    Write a deterministic name,email,age CSV for seed.bulk_insert_data.
+    Emails are unique, as user_data enforces uq_email.
+    """
+    generator = random.Random(SUITE_RANDOM_SEED)
+    with open(path, 'w', newline='', encoding='utf-8') as file:
+        writer = csv.writer(file)
+        writer.writerow(('name', 'email', 'age'))
+        for i in range(rows):
+            writer.writerow((f"User {i}", f"user{i}@bench.example.com", generator.randint(18, 99)))
+
+
+def seed_suite_database(rows: int, use_load_data: bool) -> Dict[str, Any]:
+    """
+    Create the benchmark database and load exactly rows users into user_data
+    through seed.py, reusing the table when it already holds that many rows.
+    MYSQL_DATABASE must already point at the benchmark database.
+    
+    Args:
+        rows (int): Number of users to seed
+        use_load_data (bool): Load with LOAD DATA LOCAL INFILE when allowed
+    
+    Returns:
+        Dict[str, Any]: rows, seconds spent seeding and whether the table was reused
+    """
+    server = seed.connect_db()
+    if server is None or not seed.create_database(server, os.environ['MYSQL_DATABASE']):
+        raise RuntimeError("Could not create the benchmark database")
+    server.close()
+    
+    connection = seed.connect_to_prodev()
+    try:
+        if not seed.create_table(connection):
+            raise RuntimeError("Could not create user_data in the benchmark database")
+        cursor = connection.cursor()
+        cursor.execute("SELECT COUNT(*) FROM user_data")
+        (existing,) = cursor.fetchone()
+        if existing == rows:
+            cursor.close()
+            return {'rows': rows, 'seconds': 0.0, 'reused': True}
+        
+        start = time.perf_counter()
+        cursor.execute("TRUNCATE TABLE user_data")
+        cursor.close()
+        
+        with tempfile.TemporaryDirectory() as directory:
+            csv_file = os.path.join(directory, 'user_data.csv')
+            write_seed_csv(csv_file, rows)
+            if not seed.bulk_insert_data(connection, csv_file, use_load_data=use_load_data):
+                raise RuntimeError("Seeding the benchmark database failed")
+        
+        # Refresh statistics so every run sees the same query plans
+        cursor = connection.cursor()
+        cursor.execute("ANALYZE TABLE user_data")
+        cursor.fetchall()
+        cursor.close()
+        return {'rows': rows, 'seconds': time.perf_counter() - start, 'reused': False}
+    finally:
+        connection.close()
+
+
+# Generator under test -> (function taking the batch/page size, whether it yields single rows).
+# Row-at-a-time generators are timed per batch-size rows, matching their fetchmany window.
+SUITE_GENERATORS: Dict[str, Tuple[Callable[[int], Iterable[Any]], bool]] = {
+    'stream_users': (lambda size: stream_users_module.stream_users(prefetch=size, row_format='tuple'), True),
+    'stream_users_in_batches': (lambda size: batch_processing_module.stream_users_in_batches(size, row_format='tuple'), False),
+    'lazy_paginate': (lambda size: lazy_paginate_module.lazy_paginate(size, row_format='tuple'), False),
+    'keyset_paginate': (lambda size: lazy_paginate_module.keyset_paginate(size), False),
+    'stream_user_age_batches': (lambda size: stream_ages_module.stream_user_age_batches(size), False),
+    'parallel_stream_users': (lambda size: parallel_stream_users_module.parallel_stream_users(batch_size=size, row_format='tuple'), True),
+}
+
+
+def run_suite_case(generator: str, size: int, max_rows: int) -> Dict[str, Any]:
+    """
+    Drain one generator at one batch/page size and measure it. Meant to run
+    in a fresh process so peak RSS belongs to this case alone.
+    
+    Args:
+        generator (str): Key of SUITE_GENERATORS
+        size (int): Batch or page size passed to the generator
+        max_rows (int): Stop after this many rows
+    
+    Returns:
+        Dict[str, Any]: rows, seconds, rows_per_sec, batches, p50/p99 batch latency
+        in milliseconds, and baseline and peak RSS in bytes
+    """
+    make, per_row = SUITE_GENERATORS[generator]
+    baseline = current_rss_bytes()
+    latencies = []
+    rows = 0
+    pending = 0
+    
+    start = time.perf_counter()
+    batch_start = start
+    items = make(size)
+    for item in items:
+        if per_row:
+            pending += 1
+            if pending < size:
+                continue
+        else:
+            pending = len(item)
+        now = time.perf_counter()
+        latencies.append(now - batch_start)
+        batch_start = now
+        rows += pending
+        pending = 0
+        if rows >= max_rows:
+            break
+    if pending:
+        latencies.append(time.perf_counter() - batch_start)
+        rows += pending
+    if hasattr(items, 'close'):
+        items.close()
+    elapsed = time.perf_counter() - start
+    
+    return {
+        'generator': generator,
+        'size': size,
+        'rows': rows,
+        'seconds': elapsed,
+        'rows_per_sec': rows / elapsed if elapsed else 0.0,
+        'batches': len(latencies),
+        'p50_ms': percentile(latencies, 0.50) * 1000,
+        'p99_ms': percentile(latencies, 0.99) * 1000,
+        'baseline_rss_bytes': baseline,
+        'peak_rss_bytes': peak_rss_bytes(),
+    }
+
+
+def _suite_worker(generator: str, size: int, max_rows: int, results: multiprocessing.Queue) -> None:
+    try:
+        results.put(run_suite_case(generator, size, max_rows))
+    except Exception as e:
+        results.put({'generator': generator, 'size': size, 'error': f"{type(e).__name__}: {e}"})
+
+
+def run_suite_case_process(context, generator: str, size: int, max_rows: int,
+                           timeout: Optional[float]) -> Dict[str, Any]:
+    """
+    Run one suite case in a fresh process and wait for its result.
+    A process that dies without reporting (e.g. killed for running out of
+    memory) or outlives timeout yields an error entry instead of hanging.
+    
+    Args:
+        context: multiprocessing context used to start the process
+        generator (str): Key of SUITE_GENERATORS
+        size (int): Batch or page size
+        max_rows (int): Maximum number of rows to drain
+        timeout (Optional[float]): Seconds before the case is terminated, or None
+    
+    Returns:
+        Dict[str, Any]: The case measurements, or an entry with an error
+    """
+    results = context.Queue()
+    worker = context.Process(target=_suite_worker, args=(generator, size, max_rows, results))
+    worker.start()
+    deadline = time.monotonic() + timeout if timeout is not None else None
+    
+    try:
+        while True:
+            try:
+                return results.get(timeout=1.0)
+            except queue.Empty:
+                pass
+            
+            if not worker.is_alive():
+                # The result may have been queued just before the process exited
+                try:
+                    return results.get(timeout=1.0)
+                except queue.Empty:
+                    return {'generator': generator, 'size': size,
+                            'error': f"worker exited with code {worker.exitcode} without a result"}
+            
+            if deadline is not None and time.monotonic() >= deadline:
+                worker.terminate()
+                return {'generator': generator, 'size': size,
+                        'error': f"timed out after {timeout:g}s"}
+    finally:
+        worker.join()
+        results.close()
+
+
+def environment_info() -> Dict[str, Any]:
+    """
+    Describe where the suite ran, so reports from different runs can be compared.
+    """
+    try:
+        commit = subprocess.run(['git', 'rev-parse', 'HEAD'], capture_output=True, text=True,
+                                check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    
+    server_version = None
+    connection = seed.connect_to_prodev()
+    try:
+        cursor = connection.cursor()
+        cursor.execute("SELECT VERSION()")
+        (server_version,) = cursor.fetchone()
+        cursor.close()
+    finally:
+        connection.close()
+    
+    return {
+        'timestamp': datetime.now(timezone.utc).isoformat(),
+        'git_commit': commit,
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpus': os.cpu_count(),
+        'mysql_version': server_version,
+    }
+
+
+def bench_suite(sizes: List[int], batch_sizes: List[int], generators: List[str], output: str,
+                database: str, max_offset_rows: int, use_load_data: bool,
+                case_timeout: Optional[float] = None) -> Dict[str, Any]:
+    """
+    Reproducible regression suite: for each table size, seed the benchmark
+    database through seed.py, then drain every generator at every batch/page
+    size in its own process and write the measurements to a JSON report.
+    
+    LIMIT/OFFSET pagination costs O(rows^2) overall, so lazy_paginate only
+    walks the first max_offset_rows rows of each table.
+    
+    Args:
+        sizes (List[int]): Table sizes to seed, e.g. 10K, 1M and 10M rows
+        batch_sizes (List[int]): Batch/page sizes passed to each generator
+        generators (List[str]): Keys of SUITE_GENERATORS to run
+        output (str): Path of the JSON report
+        database (str): Database to seed; never the one holding real data
+        max_offset_rows (int): Row cap for lazy_paginate
+        use_load_data (bool): Seed with LOAD DATA LOCAL INFILE when allowed
+        case_timeout (Optional[float]): Seconds before a single case is
+            terminated and recorded as an error, or None for no limit
+    
+    Returns:
+        Dict[str, Any]: The report that was written
+    """
+    unknown = set(generators) - set(SUITE_GENERATORS)
+    if unknown:
+        raise ValueError(f"Unknown generators {sorted(unknown)}, expected some of {list(SUITE_GENERATORS)}")
+    if database == 'ALX_prodev':
+        raise ValueError("The suite truncates user_data; pass a dedicated --database")
+    
+    # Every connection in this process and in the case processes uses the benchmark database
+    os.environ['MYSQL_DATABASE'] = database
+    context = multiprocessing.get_context('spawn')
+    
+    report = {
+        # Filled in once the benchmark database exists
+        'environment': None,
+        'parameters': {
+            'sizes': sizes,
+            'batch_sizes': batch_sizes,
+            'generators': generators,
+            'database': database,
+            'max_offset_rows': max_offset_rows,
+            'case_timeout': case_timeout,
+            'seed': SUITE_RANDOM_SEED,
+        },
+        'seeding': [],
+        'results': [],
+    }
+    
+    print(f"{'Table rows':>10} | {'Generator':<24} | {'Size':>6} | {'Rows/s':>10} | {'p50 ms':>8} | {'p99 ms':>8} | {'Peak MiB':>8}")
+    print("-" * 92)
+    
+    for table_rows in sizes:
+        report['seeding'].append(seed_suite_database(table_rows, use_load_data))
+        if report['environment'] is None:
+            report['environment'] = environment_info()
+        
+        for generator in generators:
+            max_rows = min(table_rows, max_offset_rows) if generator == 'lazy_paginate' else table_rows
+            for size in batch_sizes:
+                result = run_suite_case_process(context, generator, size, max_rows, case_timeout)
+                result['table_rows'] = table_rows
+                report['results'].append(result)
+                
+                if 'error' in result:
+                    print(f"{table_rows:>10} | {generator:<24} | {size:>6} | {result['error']}")
+                else:
+                    print(f"{table_rows:>10} | {generator:<24} | {size:>6} | {result['rows_per_sec']:>10.0f} | "
+                          f"{result['p50_ms']:>8.2f} | {result['p99_ms']:>8.2f} | "
+                          f"{result['peak_rss_bytes'] / 2 ** 20:>8.1f}")
+    
+    with open(output, 'w', encoding='utf-8') as file:
+        json.dump(report, file, indent=2, default=str)
+    print(f"Report written to {output}")
+    return report
+
+
+def main() -> None:
+    """
+    Parse command line arguments and run the selected benchmark.
+    """
+    parser = argparse.ArgumentParser(description="Benchmarks for python-generators-0x00")
+    subparsers = parser.add_subparsers(dest='benchmark', required=True)
+    
+    pagination = subparsers.add_parser('pagination', help="LIMIT/OFFSET vs keyset pagination")
+    pagination.add_argument('--page-size', type=int, default=1000)
+    pagination.add_argument('--max-rows', type=int, default=1_000_000)
+    
+    connections = subparsers.add_parser('connections', help="connection per page vs held connection")
+    connections.add_argument('--page-size', type=int, default=100)
+    connections.add_argument('--pages', type=int, default=1000)
+    
+    memory = subparsers.add_parser('memory', help="RSS while streaming with stream_users")
+    memory.add_argument('--max-rows', type=int, default=10_000_000)
+    memory.add_argument('--prefetch', type=int, default=100)
+    memory.add_argument('--buffered', action='store_true')
+    memory.add_argument('--samples', type=int, default=20)
+    
+    formats = subparsers.add_parser('formats', help="per-row cost of each row_format")
+    formats.add_argument('--rows', type=int, default=1_000_000)
+    formats.add_argument('--batch-size', type=int, default=1000)
+    formats.add_argument('--repeat', type=int, default=3)
+    
+    overlap = subparsers.add_parser('async', help="prefetch overlap in the async generators")
+    overlap.add_argument('--batch-size', type=int, default=1000)
+    overlap.add_argument('--batches', type=int, default=200)
+    overlap.add_argument('--work-ms', type=float, default=5.0)
+    
+    suite = subparsers.add_parser('suite', help="seed 10K/1M/10M rows and write a JSON regression report")
+    suite.add_argument('--sizes', default='10000,1000000,10000000',
+                       help="comma-separated table sizes to seed")
+    suite.add_argument('--batch-sizes', default='100,1000,10000',
+                       help="comma-separated batch/page sizes")
+    suite.add_argument('--generators', default=','.join(SUITE_GENERATORS))
+    suite.add_argument('--output', default='benchmark_report.json')
+    suite.add_argument('--database', default=SUITE_DATABASE)
+    suite.add_argument('--max-offset-rows', type=int, default=1_000_000)
+    suite.add_argument('--load-data', action='store_true',
+                       help="seed with LOAD DATA LOCAL INFILE (needs MYSQL_ALLOW_LOCAL_INFILE)")
+    suite.add_argument('--case-timeout', type=float, default=None,
+                       help="seconds before a single case is killed and recorded as an error")
+    
+    args = parser.parse_args()
+    
+    if args.benchmark == 'pagination':
+        bench_pagination(args.page_size, args.max_rows)
+    elif args.benchmark == 'connections':
+        bench_connections(args.page_size, args.pages)
+    elif args.benchmark == 'memory':
+        bench_memory(args.max_rows, args.prefetch, args.buffered, args.samples)
+    elif args.benchmark == 'formats':
+        bench_row_formats(args.rows, args.batch_size, args.repeat)
+    elif args.benchmark == 'async':
+        bench_async_overlap(args.batch_size, args.batches, args.work_ms)
+    elif args.benchmark == 'suite':
+        bench_suite([int(size) for size in args.sizes.split(',')],
+                    [int(size) for size in args.batch_sizes.split(',')],
+                    args.generators.split(','), args.output, args.database,
+                    args.max_offset_rows, args.load_data, args.case_timeout)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Row formats shared by the user_data generators.
+Cursors return plain tuples; these helpers turn them into the shape the
+caller asked for with as little per-row work as possible.
+"""
+
+import keyword
+from array import array
+from functools import lru_cache
+from typing import Any, Dict, List, Sequence, Tuple
+
+try:
+    import numpy
+except ImportError:  # numpy is optional; only row_format='numpy' needs it
+    numpy = None
+
+# 'dict' builds one dictionary per row, 'tuple' passes cursor rows through,
+# 'record' builds a __slots__ object per row; the batch formats turn a whole
+# batch into a dict of per-column lists ('columns'), array.array for numeric
+# columns ('arrays') or NumPy arrays ('numpy')
+ROW_FORMATS = ('dict', 'tuple', 'record', 'columns', 'arrays', 'numpy')
+BATCH_FORMATS = ('columns', 'arrays', 'numpy')
+
+# Compact array types for numeric user_data columns: age is DECIMAL(3,0),
+# so it always fits in 16 bits
+ARRAY_TYPECODES = {'age': 'h'}
+NUMPY_DTYPES = {'age': 'int16', 'created_at': 'datetime64[us]', 'updated_at': 'datetime64[us]'}
+
+
+def check_row_format(row_format: str, allow_batch: bool = True) -> None:
+    """
+    Validate a row_format argument.
+    
+    Args:
+        row_format (str): One of ROW_FORMATS
+        allow_batch (bool): Whether the column-oriented batch formats are allowed
+    
+    Raises:
+        ValueError: If the format is unknown or not allowed here
+        ImportError: If row_format is 'numpy' and numpy is not installed
+    """
+    if row_format not in ROW_FORMATS:
+        raise ValueError(f"Unknown row_format {row_format!r}, expected one of {ROW_FORMATS}")
+    if row_format in BATCH_FORMATS and not allow_batch:
+        raise ValueError(f"row_format {row_format!r} is only available for batches")
+    if row_format == 'numpy' and numpy is None:
+        raise ImportError("row_format 'numpy' requires numpy to be installed")
+
+
+@lru_cache(maxsize=32)
+def record_class(columns: Tuple[str, ...]) -> type:
+    """
+    Build (once per column set) a lightweight record class with __slots__,
+    so rows carry attribute access without a per-row __dict__.
+    
+    Args:
+        columns (Tuple[str, ...]): Column names in cursor order
+    
+    Returns:
+        type: Class whose constructor takes the column values positionally
+    """
+    if not all(name.isidentifier() and not keyword.iskeyword(name) for name in columns):
+        raise ValueError(f"Columns cannot be used as record attributes: {columns}")
+    
+    # Generate an __init__ with one assignment per column, the same way
+    # namedtuple and dataclasses do, to avoid a loop per row
+    body = "\n".join(f"    self.{name} = {name}" for name in columns) or "    pass"
+    namespace: Dict[str, Any] = {}
+    exec(f"def __init__(self, {', '.join(columns)}):\n{body}", namespace)
+    __init__ = namespace['__init__']
+    
+    def __repr__(self):
+        fields = ", ".join(f"{name}={getattr(self, name)!r}" for name in columns)
+        return f"UserRecord({fields})"
+    
+    def __eq__(self, other):
+        if type(other) is not type(self):
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in columns)
+    
+    return type('UserRecord', (), {
+        '__slots__': columns,
+        '__init__': __init__,
+        '__repr__': __repr__,
+        '__eq__': __eq__,
+        '__hash__': None,
+    })
+
+
+def format_rows(rows: List[Tuple[Any, ...]], columns: Sequence[str], row_format: str) -> Any:
+    """
+    Convert a batch of cursor rows into the requested format.
+    
+    Args:
+        rows (List[Tuple[Any, ...]]): Rows as returned by the cursor
+        columns (Sequence[str]): Column names in cursor order
+        row_format (str): One of ROW_FORMATS
+    
+    Returns:
+        Any: A list of rows, or a dict of column name to list of values for 'columns'
+    """
+    if row_format == 'tuple':
+        return rows
+    if row_format == 'record':
+        record = record_class(tuple(columns))
+        return [record(*row) for row in rows]
+    if row_format in BATCH_FORMATS:
+        values = list(zip(*rows)) if rows else [()] * len(columns)
+        if row_format == 'arrays':
+            return {column: to_array(column, column_values) for column, column_values in zip(columns, values)}
+        if row_format == 'numpy':
+            return {column: to_numpy(column, column_values) for column, column_values in zip(columns, values)}
+        return dict(zip(columns, map(list, values)))
+    return [dict(zip(columns, row)) for row in rows]
+
+
+def to_array(column: str, values: Sequence[Any]) -> Any:
+    """
+    Pack one column of a batch into an array.array when it has a numeric
+    typecode in ARRAY_TYPECODES, otherwise into a list.
+    
+    Args:
+        column (str): Column name
+        values (Sequence[Any]): The column's values for the batch
+    
+    Returns:
+        Any: array.array or list
+    """
+    typecode = ARRAY_TYPECODES.get(column)
+    if typecode is None:
+        return list(values)
+    # DECIMAL columns arrive as Decimal, which array.array does not accept
+    return array(typecode, map(int, values))
+
+
+def to_numpy(column: str, values: Sequence[Any]) -> Any:
+    """
+    Pack one column of a batch into a NumPy array, typed by NUMPY_DTYPES
+    and falling back to an object array for other columns.
+    
+    Args:
+        column (str): Column name
+        values (Sequence[Any]): The column's values for the batch
+    
+    Returns:
+        numpy.ndarray: The column as an array
+    """
+    dtype = NUMPY_DTYPES.get(column)
+    if dtype is None:
+        return numpy.array(values, dtype=object)
+    if numpy.issubdtype(numpy.dtype(dtype), numpy.integer):
+        return numpy.fromiter(map(int, values), dtype=dtype, count=len(values))
+    return numpy.array(values, dtype=dtype)
@@ -6,45 +6,327 @@ Creates database and user_data table with specified structure
 
 import mysql.connector
 from mysql.connector import Error
+from mysql.connector.errors import PoolError
 import sys
 import os
-from getpass import getpass
 import csv
 import uuid
+import threading
+import time
+from collections import deque
+from typing import Any, Deque, Dict, Iterator, List, Optional, Tuple
+
+try:
+    from dotenv import load_dotenv
+except ImportError:  # python-dotenv is optional; plain environment variables still work
+    load_dotenv = None
+
+# Columns of the user_data table, used to validate caller-supplied identifiers
+USER_DATA_COLUMNS = ('user_id', 'name', 'email', 'age', 'created_at', 'updated_at')
+
+# Rows queued by insert_data before they are deduplicated and inserted together
+INSERT_CHUNK_SIZE = 1000
+
+
+def get_db_config(database: Optional[str] = 'ALX_prodev') -> Dict[str, Any]:
+    """
+    Builds MySQL connection settings from the environment (and a .env file
+    when python-dotenv is installed) so no interactive prompt is needed.
+    
+    Recognised variables: MYSQL_HOST, MYSQL_PORT, MYSQL_USER, MYSQL_PASSWORD,
+    MYSQL_DATABASE and MYSQL_ALLOW_LOCAL_INFILE (needed for bulk_insert_data
+    with use_load_data=True).
+    
+    Args:
+        database (Optional[str]): Default database when MYSQL_DATABASE is unset;
+            None connects to the server without selecting a database
+    
+    Returns:
+        Dict[str, Any]: Keyword arguments for mysql.connector.connect
+    """
+    if load_dotenv is not None:
+        load_dotenv()
+    
+    config = {
+        'host': os.environ.get('MYSQL_HOST', 'localhost'),
+        'port': int(os.environ.get('MYSQL_PORT', '3306')),
+        'user': os.environ.get('MYSQL_USER', 'root'),
+        'password': os.environ.get('MYSQL_PASSWORD', ''),
+    }
+    if database is not None:
+        config['database'] = os.environ.get('MYSQL_DATABASE', database)
+    if os.environ.get('MYSQL_ALLOW_LOCAL_INFILE', '').lower() in ('1', 'true', 'yes'):
+        config['allow_local_infile'] = True
+    return config
+
+
+class PooledConnection:
+    """
+    Wrapper around a pooled mysql.connector connection.
+    Behaves like the underlying connection, except that close() hands it back
+    to the pool instead of closing the socket.
+    """
+    
+    def __init__(self, pool: 'ConnectionPool', connection):
+        self._pool = pool
+        self._connection = connection
+    
+    def __getattr__(self, name):
+        if self._connection is None:
+            raise PoolError("Connection has already been returned to the pool")
+        return getattr(self._connection, name)
+    
+    def close(self) -> None:
+        """
+        Return the connection to the pool. Safe to call more than once.
+        """
+        if self._connection is not None:
+            connection, self._connection = self._connection, None
+            self._pool.release(connection)
+    
+    def discard(self) -> None:
+        """
+        Close the underlying connection instead of returning it to the pool,
+        e.g. when an unbuffered result set was abandoned part way through.
+        """
+        if self._connection is not None:
+            connection, self._connection = self._connection, None
+            self._pool.discard(connection)
+
+
+class ConnectionPool:
+    """
+    Bounded, thread-safe pool of mysql.connector connections.
+    
+    Idle connections are reused most-recently-returned first, closed once they
+    have been idle longer than max_idle seconds, and pinged before reuse when
+    they have been idle longer than ping_after seconds. Checkout latency is
+    recorded for every get_connection() call.
+    """
+    
+    def __init__(self, config: Dict[str, Any], size: int = 5, max_idle: float = 300.0,
+                 ping_after: float = 5.0, timeout: float = 30.0, latency_window: int = 1024):
+        """
+        Initialize the pool. Connections are opened lazily on first checkout.
+        
+        Args:
+            config (Dict[str, Any]): Keyword arguments for mysql.connector.connect
+            size (int): Maximum number of open connections
+            max_idle (float): Seconds after which an idle connection is evicted
+            ping_after (float): Idle seconds after which a connection is health checked
+            timeout (float): Seconds to wait for a free connection before raising PoolError
+            latency_window (int): Number of recent checkout latencies kept for percentiles
+        """
+        if size <= 0:
+            raise ValueError("Pool size must be a positive integer")
+        
+        self.config = config
+        self.size = size
+        self.max_idle = max_idle
+        self.ping_after = ping_after
+        self.timeout = timeout
+        
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(size)
+        self._idle: Deque[Tuple[Any, float]] = deque()
+        self._latencies: Deque[float] = deque(maxlen=latency_window)
+        self._counters = {
+            'checkouts': 0,
+            'created': 0,
+            'evicted_idle': 0,
+            'evicted_unhealthy': 0,
+            'discarded': 0,
+            'in_use': 0,
+        }
+        self._total_latency = 0.0
+        self._max_latency = 0.0
+    
+    def get_connection(self) -> PooledConnection:
+        """
+        Check a connection out of the pool, opening a new one if none is idle.
+        
+        Returns:
+            PooledConnection: Connection whose close() returns it to the pool
+        
+        Raises:
+            PoolError: If no connection becomes free within the timeout
+        """
+        start = time.perf_counter()
+        if not self._slots.acquire(timeout=self.timeout):
+            raise PoolError(f"No connection available within {self.timeout} seconds")
+        
+        try:
+            connection = self._take_idle()
+            if connection is None:
+                connection = mysql.connector.connect(**self.config)
+                with self._lock:
+                    self._counters['created'] += 1
+        except Exception:
+            self._slots.release()
+            raise
+        
+        latency = time.perf_counter() - start
+        with self._lock:
+            self._counters['checkouts'] += 1
+            self._counters['in_use'] += 1
+            self._latencies.append(latency)
+            self._total_latency += latency
+            self._max_latency = max(self._max_latency, latency)
+        
+        return PooledConnection(self, connection)
+    
+    def _take_idle(self):
+        """
+        Pop the most recently returned healthy idle connection, evicting stale ones.
+        """
+        while True:
+            with self._lock:
+                if not self._idle:
+                    return None
+                connection, returned_at = self._idle.pop()
+            
+            idle_for = time.monotonic() - returned_at
+            if idle_for > self.max_idle:
+                self._discard(connection, 'evicted_idle')
+                continue
+            if idle_for > self.ping_after and not connection.is_connected():
+                self._discard(connection, 'evicted_unhealthy')
+                continue
+            return connection
+    
+    def _discard(self, connection, counter: str) -> None:
+        """
+        Close a connection that is leaving the pool and count why.
+        """
+        try:
+            connection.close()
+        except Error:
+            pass
+        with self._lock:
+            self._counters[counter] += 1
+    
+    def release(self, connection) -> None:
+        """
+        Return a checked-out connection to the pool.
+        Any open transaction is rolled back and the session is reset
+        (COM_RESET_CONNECTION), dropping prepared statements, user variables
+        and temporary tables, so the next user starts clean.
+        
+        Unread rows of a result are drained first; generators that stop
+        early on an unbuffered cursor should discard() instead.
+        """
+        try:
+            connection.consume_results()
+            connection.rollback()
+            connection.reset_session()
+        except Error:
+            self._discard(connection, 'evicted_unhealthy')
+        else:
+            with self._lock:
+                self._idle.append((connection, time.monotonic()))
+        finally:
+            with self._lock:
+                self._counters['in_use'] -= 1
+            self._slots.release()
+    
+    def discard(self, connection) -> None:
+        """
+        Close a checked-out connection and free its slot without reusing it.
+        """
+        try:
+            connection.close()
+        except Error:
+            pass
+        finally:
+            with self._lock:
+                self._counters['in_use'] -= 1
+                self._counters['discarded'] += 1
+            self._slots.release()
+    
+    def close_all(self) -> None:
+        """
+        Close every idle connection. Checked-out connections are unaffected.
+        """
+        with self._lock:
+            idle, self._idle = list(self._idle), deque()
+        for connection, _ in idle:
+            try:
+                connection.close()
+            except Error:
+                pass
+    
+    def stats(self) -> Dict[str, Any]:
+        """
+        Snapshot of pool counters and checkout latency metrics.
+        
+        Returns:
+            Dict[str, Any]: Counters plus idle count and latency mean/p50/p99/max in seconds
+        """
+        with self._lock:
+            stats = dict(self._counters)
+            stats['idle'] = len(self._idle)
+            latencies = sorted(self._latencies)
+            checkouts = self._counters['checkouts']
+            stats['checkout_mean_seconds'] = self._total_latency / checkouts if checkouts else 0.0
+            stats['checkout_max_seconds'] = self._max_latency
+        
+        if latencies:
+            stats['checkout_p50_seconds'] = latencies[len(latencies) // 2]
+            stats['checkout_p99_seconds'] = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+        else:
+            stats['checkout_p50_seconds'] = 0.0
+            stats['checkout_p99_seconds'] = 0.0
+        return stats
+
+
+_pool: Optional[ConnectionPool] = None
+_pool_lock = threading.Lock()
+
+
+def get_pool() -> ConnectionPool:
+    """
+    Returns the shared ALX_prodev connection pool, creating it on first use.
+    Pool limits come from MYSQL_POOL_SIZE, MYSQL_POOL_MAX_IDLE and
+    MYSQL_POOL_TIMEOUT.
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ConnectionPool(
+                get_db_config(),
+                size=int(os.environ.get('MYSQL_POOL_SIZE', '5')),
+                max_idle=float(os.environ.get('MYSQL_POOL_MAX_IDLE', '300')),
+                timeout=float(os.environ.get('MYSQL_POOL_TIMEOUT', '30')),
+            )
+        return _pool
+
 
 def connect_db():
     """
     Connects to the MySQL database server
     """
+    config = get_db_config(database=None)
     try:
-        host = input("Enter MySQL host (default: localhost): ") or 'localhost'
-        user = input("Enter MySQL username (default: root): ") or 'root'
-        password = getpass("Enter MySQL password: ")
-        
-        connection = mysql.connector.connect(
-            host=host,
-            user=user,
-            password=password
-        )
+        connection = mysql.connector.connect(**config)
         
         if connection.is_connected():
-            print(f"Successfully connected to MySQL server at {host}")
+            print(f"Successfully connected to MySQL server at {config['host']}")
             return connection
     
     except Error as e:
         print(f"Error connecting to MySQL: {e}")
         return None
 
-def create_database(connection):
+def create_database(connection, database='ALX_prodev'):
     """
-    Creates the database ALX_prodev if it does not exist
+    Creates the database ALX_prodev (or the given database) if it does not exist
     """
     try:
         cursor = connection.cursor()
         
         # Create database if it doesn't exist
-        cursor.execute("CREATE DATABASE IF NOT EXISTS ALX_prodev")
-        print("Database 'ALX_prodev' created successfully (or already exists)")
+        cursor.execute(f"CREATE DATABASE IF NOT EXISTS `{database}`")
+        print(f"Database '{database}' created successfully (or already exists)")
         
         cursor.close()
         return True
@@ -56,22 +338,10 @@ def create_database(connection):
 def connect_to_prodev():
     """
     Connects to the ALX_prodev database in MySQL
+    Checks a connection out of the shared pool; close() returns it to the pool.
     """
     try:
-        host = input("Enter MySQL host (default: localhost): ") or 'localhost'
-        user = input("Enter MySQL username (default: root): ") or 'root'
-        password = getpass("Enter MySQL password: ")
-        
-        connection = mysql.connector.connect(
-            host=host,
-            user=user,
-            password=password,
-            database='ALX_prodev'
-        )
-        
-        if connection.is_connected():
-            print("Successfully connected to ALX_prodev database")
-            return connection
+        return get_pool().get_connection()
     
     except Error as e:
         print(f"Error connecting to ALX_prodev database: {e}")
@@ -92,20 +362,47 @@ def create_table(connection):
             email VARCHAR(255) NOT NULL,
             age DECIMAL(3,0) NOT NULL,
             created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+            UNIQUE KEY uq_email (email)
         )
         """
         
         cursor.execute(create_table_query)
         print("Table 'user_data' created successfully (or already exists)")
         
-        # Create index on email for better query performance
+        # Enforce unique emails on tables created before uq_email existed;
+        # the unique index also serves email lookups, replacing idx_email
         email_index_query = """
-        CREATE INDEX IF NOT EXISTS idx_email ON user_data(email)
+        CREATE UNIQUE INDEX IF NOT EXISTS uq_email ON user_data(email)
         """
         
         cursor.execute(email_index_query)
-        print("Index on email created successfully")
+        cursor.execute("DROP INDEX IF EXISTS idx_email ON user_data")
+        print("Unique index on email created successfully")
+        
+        # Create index on age so batch_processing's age filter can use it
+        age_index_query = """
+        CREATE INDEX IF NOT EXISTS idx_age ON user_data(age)
+        """
+        
+        cursor.execute(age_index_query)
+        print("Index on age created successfully")
+        
+        # Create composite index backing stream_user_changes' watermark seeks
+        changes_index_query = """
+        CREATE INDEX IF NOT EXISTS idx_updated_at_user_id ON user_data(updated_at, user_id)
+        """
+        
+        cursor.execute(changes_index_query)
+        print("Index on (updated_at, user_id) created successfully")
+        
+        # Create composite index backing keyset pagination in lazy_paginate
+        keyset_index_query = """
+        CREATE INDEX IF NOT EXISTS idx_created_at_user_id ON user_data(created_at, user_id)
+        """
+        
+        cursor.execute(keyset_index_query)
+        print("Index on (created_at, user_id) created successfully")
         
         # Show table structure
         cursor.execute("DESCRIBE user_data")
@@ -124,6 +421,61 @@ def create_table(connection):
         print(f"Error creating table: {e}")
         return False
     
+def filter_new_users(cursor, rows):
+    """
+    Removes rows whose email is repeated within the chunk or already stored.
+    Duplicates inside the chunk are dropped with a set, and existing emails
+    are found with a single WHERE email IN (...) probe, so deduplication costs
+    one round trip per chunk rather than one per row.
+    
+    Args:
+        cursor: Cursor on the ALX_prodev database
+        rows: Sequence of (user_id, name, email, age) tuples
+    
+    Returns:
+        list: Rows whose email is new, in their original order
+    """
+    # Emails compare case-insensitively under MySQL's default collation
+    unique_rows = {}
+    for row in rows:
+        unique_rows.setdefault(row[2].lower(), row)
+    
+    if not unique_rows:
+        return []
+    
+    placeholders = ", ".join(["%s"] * len(unique_rows))
+    cursor.execute(
+        f"SELECT email FROM user_data WHERE email IN ({placeholders})",
+        tuple(row[2] for row in unique_rows.values())
+    )
+    existing = {email.lower() for (email,) in cursor.fetchall()}
+    
+    return [row for key, row in unique_rows.items() if key not in existing]
+
+
+def insert_new_users(cursor, rows):
+    """
+    Inserts the rows of a chunk whose email does not exist yet.
+    INSERT IGNORE still guards against the unique email index in case another
+    writer inserted the same email after the probe.
+    
+    Args:
+        cursor: Cursor on the ALX_prodev database
+        rows: Sequence of (user_id, name, email, age) tuples
+    
+    Returns:
+        list: Rows that were sent for insertion
+    """
+    new_rows = filter_new_users(cursor, rows)
+    if new_rows:
+        insert_query = """
+        INSERT IGNORE INTO user_data (user_id, name, email, age)
+        VALUES (%s, %s, %s, %s)
+        """
+        cursor.executemany(insert_query, new_rows)
+    return new_rows
+
+
 def insert_data(connection, csv_file='user_data.csv'):
     """
     Inserts data in the database from a CSV file if it does not exist
@@ -155,6 +507,18 @@ def insert_data(connection, csv_file='user_data.csv'):
             
             print(f"Reading data from '{csv_file}'...")
             
+            def flush_pending(rows):
+                """Insert a chunk of queued rows, reporting each one."""
+                new_rows = insert_new_users(cursor, rows)
+                new_ids = {row[0] for row in new_rows}
+                for user_id, name, email, _ in rows:
+                    if user_id in new_ids:
+                        print(f"Inserted record for user: {name} ({email})")
+                    else:
+                        print(f"Record with email {email} already exists, skipping...")
+                return len(new_rows), len(rows) - len(new_rows)
+            
+            pending = []
             for row_num, row in enumerate(csv_reader, start=2):  # Start at 2 (header is row 1)
                 try:
                     # Extract and validate data
@@ -173,26 +537,8 @@ def insert_data(connection, csv_file='user_data.csv'):
                         skipped_count += 1
                         continue
                     
-                    # Generate UUID for user_id
-                    user_id = str(uuid.uuid4())
-                    
-                    # Check if email already exists (assuming email should be unique)
-                    check_query = "SELECT COUNT(*) FROM user_data WHERE email = %s"
-                    cursor.execute(check_query, (email,))
-                    count = cursor.fetchone()[0]
-                    
-                    if count == 0:
-                        # Insert data if it doesn't exist
-                        insert_query = """
-                        INSERT INTO user_data (user_id, name, email, age) 
-                        VALUES (%s, %s, %s, %s)
-                        """
-                        cursor.execute(insert_query, (user_id, name, email, age))
-                        print(f"Inserted record for user: {name} ({email})")
-                        inserted_count += 1
-                    else:
-                        print(f"Record with email {email} already exists, skipping...")
-                        skipped_count += 1
+                    # Queue the row; duplicates are resolved per chunk
+                    pending.append((str(uuid.uuid4()), name, email, age))
                 
                 except ValueError as ve:
                     print(f"Row {row_num}: Invalid data format - {ve}")
@@ -202,6 +548,17 @@ def insert_data(connection, csv_file='user_data.csv'):
                     print(f"Row {row_num}: Error processing row - {e}")
                     skipped_count += 1
                     continue
+                
+                if len(pending) >= INSERT_CHUNK_SIZE:
+                    inserted, skipped = flush_pending(pending)
+                    inserted_count += inserted
+                    skipped_count += skipped
+                    pending = []
+            
+            if pending:
+                inserted, skipped = flush_pending(pending)
+                inserted_count += inserted
+                skipped_count += skipped
         
         connection.commit()
         
@@ -235,6 +592,209 @@ def insert_data(connection, csv_file='user_data.csv'):
  
 
 
+def read_csv_chunks(csv_file: str, chunk_size: int) -> Iterator[Tuple[List[Tuple[str, str, str, int]], int]]:
+    """
+    Generator that streams validated user rows from a CSV file in chunks.
+    CSV file should have columns: name, email, age
+    
+    Args:
+        csv_file (str): Path to the CSV file
+        chunk_size (int): Maximum number of valid rows per chunk
+    
+    Yields:
+        Tuple[List[Tuple[str, str, str, int]], int]: (user_id, name, email, age)
+        rows ready for insertion, and the number of invalid rows skipped
+        while reading the chunk
+    """
+    with open(csv_file, 'r', newline='', encoding='utf-8') as file:
+        csv_reader = csv.DictReader(file)
+        
+        # Validate CSV headers
+        expected_columns = {'name', 'email', 'age'}
+        if not expected_columns.issubset(csv_reader.fieldnames or []):
+            raise ValueError(f"CSV file must contain columns: {expected_columns}, "
+                             f"found: {csv_reader.fieldnames}")
+        
+        chunk = []
+        invalid = 0
+        for row in csv_reader:
+            try:
+                name = row['name'].strip()
+                email = row['email'].strip()
+                age = int(row['age'])
+            except (AttributeError, ValueError):
+                invalid += 1
+                continue
+            
+            if not name or not email or age <= 0:
+                invalid += 1
+                continue
+            
+            chunk.append((str(uuid.uuid4()), name, email, age))
+            if len(chunk) >= chunk_size:
+                yield chunk, invalid
+                chunk = []
+                invalid = 0
+        
+        if chunk or invalid:
+            yield chunk, invalid
+
+
+def load_data_infile(connection, csv_file: str) -> int:
+    """
+    Loads a CSV file server-side with LOAD DATA LOCAL INFILE.
+    Requires a connection opened with allow_local_infile=True and local_infile
+    enabled on the server. Rows whose key already exists are ignored.
+    
+    The file is loaded as raw text into a temporary staging table and only
+    rows passing the same checks as read_csv_chunks (non-empty name and
+    email, integer age above zero) are copied into user_data. Both LF and
+    CRLF line endings are accepted, judged from the header line.
+    
+    Args:
+        connection: MySQL connection to ALX_prodev
+        csv_file (str): Path to the CSV file
+    
+    Returns:
+        int: Number of rows inserted
+    """
+    with open(csv_file, 'rb') as file:
+        first_line = file.readline()
+    header = [column.strip() for column in next(csv.reader([first_line.decode('utf-8')]), [])]
+    line_terminator = '\\r\\n' if first_line.endswith(b'\r\n') else '\\n'
+    
+    # Validate CSV headers
+    expected_columns = {'name', 'email', 'age'}
+    if not expected_columns.issubset(header):
+        raise ValueError(f"CSV file must contain columns: {expected_columns}, "
+                         f"found: {header}")
+    
+    # Map CSV columns onto staging columns, discarding anything else
+    targets = [column if column in expected_columns else '@unused' for column in header]
+    
+    load_query = f"""
+    LOAD DATA LOCAL INFILE %s INTO TABLE user_data_staging
+    CHARACTER SET utf8mb4
+    FIELDS TERMINATED BY ',' OPTIONALLY ENCLOSED BY '"'
+    LINES TERMINATED BY '{line_terminator}'
+    IGNORE 1 LINES
+    ({', '.join(targets)})
+    """
+    
+    # Same rules as read_csv_chunks; int() also accepts surrounding whitespace and a sign
+    insert_query = """
+    INSERT IGNORE INTO user_data (user_id, name, email, age)
+    SELECT UUID(), TRIM(name), TRIM(email), CAST(TRIM(age) AS SIGNED)
+    FROM user_data_staging
+    WHERE TRIM(name) <> '' AND TRIM(email) <> ''
+      AND age REGEXP '^[[:space:]]*[+-]?[0-9]+[[:space:]]*$'
+      AND CAST(TRIM(age) AS SIGNED) > 0
+    """
+    
+    cursor = connection.cursor()
+    staging_created = False
+    try:
+        cursor.execute("""
+        CREATE TEMPORARY TABLE user_data_staging (
+            name TEXT,
+            email TEXT,
+            age VARCHAR(64)
+        ) CHARACTER SET utf8mb4
+        """)
+        staging_created = True
+        cursor.execute(load_query, (os.path.abspath(csv_file),))
+        cursor.execute(insert_query)
+        inserted = cursor.rowcount
+        connection.commit()
+        return inserted
+    finally:
+        if staging_created:
+            try:
+                cursor.execute("DROP TEMPORARY TABLE IF EXISTS user_data_staging")
+            except Error:
+                # Keep the original error; the table goes with the session anyway
+                pass
+        cursor.close()
+
+
+def bulk_insert_data(connection, csv_file='user_data.csv', chunk_size=10000, use_load_data=False):
+    """
+    Bulk loads users from a CSV file, for files too large for insert_data.
+    
+    The CSV is streamed in chunks of chunk_size rows; each chunk is
+    deduplicated with filter_new_users, written with a single multi-row
+    INSERT IGNORE (via executemany) and committed, so existing emails are
+    skipped without a per-row lookup. With
+    use_load_data=True the file is handed to LOAD DATA LOCAL INFILE instead,
+    falling back to chunked inserts if the server or connection refuses it.
+    
+    Args:
+        connection: MySQL connection to ALX_prodev
+        csv_file (str): Path to the CSV file with columns name, email, age
+        chunk_size (int): Number of rows per INSERT and per commit
+        use_load_data (bool): Try LOAD DATA LOCAL INFILE first
+    
+    Returns:
+        bool: True if the load completed, False otherwise
+    """
+    if not os.path.exists(csv_file):
+        print(f"Error: CSV file '{csv_file}' not found")
+        return False
+    
+    start = time.perf_counter()
+    
+    if use_load_data:
+        try:
+            inserted_count = load_data_infile(connection, csv_file)
+            elapsed = time.perf_counter() - start
+            print(f"Loaded {inserted_count} records with LOAD DATA LOCAL INFILE in {elapsed:.2f}s "
+                  f"({inserted_count / elapsed if elapsed else 0:.0f} rows/sec)")
+            return True
+        except ValueError as e:
+            print(f"Error: {e}")
+            return False
+        except Error as e:
+            connection.rollback()
+            print(f"LOAD DATA LOCAL INFILE unavailable ({e}), falling back to batched inserts")
+            start = time.perf_counter()
+    
+    inserted_count = 0
+    skipped_count = 0
+    cursor = connection.cursor()
+    
+    try:
+        print(f"Bulk loading '{csv_file}' in chunks of {chunk_size} rows...")
+        
+        for chunk, invalid in read_csv_chunks(csv_file, chunk_size):
+            skipped_count += invalid
+            if not chunk:
+                continue
+            
+            new_rows = insert_new_users(cursor, chunk)
+            connection.commit()
+            
+            inserted = cursor.rowcount if new_rows else 0
+            inserted_count += inserted
+            skipped_count += len(chunk) - inserted
+        
+    except ValueError as e:
+        print(f"Error: {e}")
+        return False
+    except Error as e:
+        connection.rollback()
+        print(f"Error bulk inserting data: {e}")
+        return False
+    finally:
+        cursor.close()
+    
+    elapsed = time.perf_counter() - start
+    print(f"\nBulk load summary:")
+    print(f"Records inserted: {inserted_count}")
+    print(f"Records skipped: {skipped_count}")
+    print(f"Elapsed: {elapsed:.2f}s ({inserted_count / elapsed if elapsed else 0:.0f} rows/sec)")
+    return True
+
+
 def main():
     """
     Main function to set up the database
@@ -250,7 +810,7 @@ def main():
     
     try:
         # Step 2: Create database
-        if not create_database(connection):
+        if not create_database(connection, get_db_config()['database']):
             print("Failed to create database. Exiting...")
             sys.exit(1)
         
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""Unit tests for the filter and batch sizing helpers in 1-batch_processing."""
+
+import unittest
+
+batch_processing = __import__('1-batch_processing')
+AdaptiveBatchSize = batch_processing.AdaptiveBatchSize
+compile_conditions = batch_processing.compile_conditions
+
+
+class TestCompileConditions(unittest.TestCase):
+    """Test cases for the compile_conditions function."""
+
+    def test_no_conditions(self) -> None:
+        """Test that no conditions give an empty WHERE clause."""
+        self.assertEqual(compile_conditions([]), ("", (), []))
+
+    def test_tuples_pushed_down(self) -> None:
+        """Test that (column, operator, value) tuples become a parameterised WHERE clause."""
+        where, params, predicates = compile_conditions([('age', '>', 25), ('name', '=', 'Ann')])
+        self.assertEqual(where, " WHERE age > %s AND name = %s")
+        self.assertEqual(params, (25, 'Ann'))
+        self.assertEqual(predicates, [])
+
+    def test_callables_kept_in_python(self) -> None:
+        """Test that callables are returned as predicates in their original order."""
+        first = lambda user: True
+        second = lambda user: False
+        where, params, predicates = compile_conditions([first, ('age', '<=', 40), second])
+        self.assertEqual(where, " WHERE age <= %s")
+        self.assertEqual(params, (40,))
+        self.assertEqual(predicates, [first, second])
+
+    def test_value_never_inlined(self) -> None:
+        """Test that values only travel as parameters, never in the SQL text."""
+        where, params, _ = compile_conditions([('email', '=', "x' OR '1'='1")])
+        self.assertNotIn("OR", where)
+        self.assertEqual(params, ("x' OR '1'='1",))
+
+    def test_invalid_conditions(self) -> None:
+        """Test that unknown columns and operators raise ValueError."""
+        for condition in (('password', '=', 'x'), ('age', 'LIKE', '%1'), ('age; DROP', '=', 1)):
+            with self.subTest(condition=condition):
+                with self.assertRaises(ValueError):
+                    compile_conditions([condition])
+
+
+class TestAdaptiveBatchSize(unittest.TestCase):
+    """Test cases for the AdaptiveBatchSize class."""
+
+    def test_requires_a_target(self) -> None:
+        """Test that at least one of target_seconds and target_bytes is required."""
+        with self.assertRaises(ValueError):
+            AdaptiveBatchSize(100)
+
+    def test_invalid_bounds(self) -> None:
+        """Test that min_size must be positive and at most max_size."""
+        with self.assertRaises(ValueError):
+            AdaptiveBatchSize(100, target_seconds=1.0, min_size=0)
+        with self.assertRaises(ValueError):
+            AdaptiveBatchSize(100, target_seconds=1.0, min_size=50, max_size=10)
+
+    def test_initial_size_clamped(self) -> None:
+        """Test that the initial size is clamped into [min_size, max_size]."""
+        self.assertEqual(AdaptiveBatchSize(1, target_seconds=1.0, min_size=10).size, 10)
+        self.assertEqual(AdaptiveBatchSize(10 ** 9, target_seconds=1.0, max_size=500).size, 500)
+
+    def test_converges_on_target_seconds(self) -> None:
+        """Test that the size moves toward the one hitting target_seconds, one step at a time."""
+        sizer = AdaptiveBatchSize(100, target_seconds=1.0, max_step=2.0)
+        # 1 ms per row wants 1000 rows, but each step is limited to doubling
+        self.assertEqual(sizer.observe(100, 0.1, 0), 200)
+        self.assertEqual(sizer.observe(200, 0.2, 0), 400)
+        self.assertEqual(sizer.observe(400, 0.4, 0), 800)
+        self.assertEqual(sizer.observe(800, 0.8, 0), 1000)
+        self.assertEqual(sizer.observe(1000, 1.0, 0), 1000)
+
+    def test_shrinks_when_slow(self) -> None:
+        """Test that slow batches shrink the size, bounded by max_step."""
+        sizer = AdaptiveBatchSize(1000, target_seconds=0.1, max_step=2.0)
+        self.assertEqual(sizer.observe(1000, 10.0, 0), 500)
+
+    def test_smaller_target_wins(self) -> None:
+        """Test that the size honours whichever of the two targets is tighter."""
+        sizer = AdaptiveBatchSize(100, target_seconds=1.0, target_bytes=10000, max_step=100.0)
+        # Time alone would allow 1000 rows, 100 bytes per row only 100
+        self.assertEqual(sizer.observe(100, 0.1, 10000), 100)
+
+    def test_bounds_and_empty_batches(self) -> None:
+        """Test that sizes stay within [min_size, max_size] and empty batches change nothing."""
+        sizer = AdaptiveBatchSize(100, target_seconds=1.0, min_size=50, max_size=150, max_step=10.0)
+        self.assertEqual(sizer.observe(100, 0.001, 0), 150)
+        self.assertEqual(sizer.observe(150, 100.0, 0), 50)
+        self.assertEqual(sizer.observe(0, 5.0, 0), 50)
+
+    def test_smoothing(self) -> None:
+        """Test that per-row costs are tracked as a moving average."""
+        sizer = AdaptiveBatchSize(100, target_seconds=1.0, smoothing=0.5)
+        sizer.observe(100, 0.1, 1000)
+        sizer.observe(100, 0.3, 3000)
+        self.assertAlmostEqual(sizer.seconds_per_row, 0.002)
+        self.assertAlmostEqual(sizer.bytes_per_row, 20.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
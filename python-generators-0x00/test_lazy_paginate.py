@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""Unit tests for the read_ahead prefetcher in 2-lazy_paginate."""
+
+import threading
+import unittest
+
+read_ahead = __import__('2-lazy_paginate').read_ahead
+
+
+class TestReadAhead(unittest.TestCase):
+    """Test cases for the read_ahead function."""
+
+    def test_yields_items_in_order(self) -> None:
+        """Test that every item comes through in the source order."""
+        for depth in (1, 3, 100):
+            with self.subTest(depth=depth):
+                self.assertEqual(list(read_ahead(iter(range(50)), depth)), list(range(50)))
+
+    def test_empty_source(self) -> None:
+        """Test that an empty source yields nothing."""
+        self.assertEqual(list(read_ahead(iter([]), 2)), [])
+
+    def test_invalid_depth(self) -> None:
+        """Test that a depth below one raises ValueError."""
+        with self.assertRaises(ValueError):
+            next(read_ahead(iter([1]), 0))
+
+    def test_error_propagates_after_earlier_items(self) -> None:
+        """Test that an error in the source reaches the consumer after the items before it."""
+        def pages():
+            yield 1
+            yield 2
+            raise RuntimeError("page failed")
+
+        items = read_ahead(pages(), 2)
+        self.assertEqual(next(items), 1)
+        self.assertEqual(next(items), 2)
+        with self.assertRaisesRegex(RuntimeError, "page failed"):
+            next(items)
+
+    def test_early_close_closes_source_on_worker(self) -> None:
+        """Test that closing early stops the worker and closes the source on its thread."""
+        closed_on = []
+        consumer = threading.current_thread()
+
+        def pages():
+            try:
+                for page in range(1000):
+                    yield page
+            finally:
+                closed_on.append(threading.current_thread())
+
+        before = threading.active_count()
+        items = read_ahead(pages(), 2)
+        self.assertEqual(next(items), 0)
+        items.close()
+        self.assertEqual(len(closed_on), 1)
+        self.assertIsNot(closed_on[0], consumer)
+        self.assertEqual(threading.active_count(), before)
+
+
+if __name__ == '__main__':
+    unittest.main()
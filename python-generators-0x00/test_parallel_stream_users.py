@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""Unit tests for key-range partitioning in 5-parallel_stream_users."""
+
+import unittest
+import uuid
+
+partition_bounds = __import__('5-parallel_stream_users').partition_bounds
+
+
+def find_partitions(bounds, key):
+    """Indexes of the ranges in bounds that contain key."""
+    return [index for index, (lower, upper) in enumerate(bounds)
+            if (lower is None or key >= lower) and (upper is None or key < upper)]
+
+
+class TestPartitionBounds(unittest.TestCase):
+    """Test cases for the partition_bounds function."""
+
+    def test_single_partition(self) -> None:
+        """Test that one partition is unbounded on both sides."""
+        self.assertEqual(partition_bounds(1), [(None, None)])
+
+    def test_even_split(self) -> None:
+        """Test that ranges are cut on two-character hex prefixes."""
+        self.assertEqual(partition_bounds(4), [(None, '40'), ('40', '80'), ('80', 'c0'), ('c0', None)])
+
+    def test_ranges_are_contiguous(self) -> None:
+        """Test that each range starts where the previous one ends, in increasing order."""
+        for partitions in (2, 3, 7, 16, 255, 256):
+            with self.subTest(partitions=partitions):
+                bounds = partition_bounds(partitions)
+                self.assertEqual(len(bounds), partitions)
+                self.assertIsNone(bounds[0][0])
+                self.assertIsNone(bounds[-1][1])
+                for (_, upper), (lower, _) in zip(bounds, bounds[1:]):
+                    self.assertEqual(upper, lower)
+                edges = [upper for _, upper in bounds[:-1]]
+                self.assertEqual(edges, sorted(set(edges)))
+
+    def test_every_key_in_exactly_one_range(self) -> None:
+        """Test that every UUID, including the extremes, falls in exactly one range."""
+        keys = [str(uuid.uuid4()) for _ in range(200)]
+        keys += ['00000000-0000-0000-0000-000000000000', 'ffffffff-ffff-ffff-ffff-ffffffffffff',
+                 '40000000-0000-0000-0000-000000000000', '3fffffff-ffff-ffff-ffff-ffffffffffff']
+        for partitions in (1, 3, 16, 256):
+            bounds = partition_bounds(partitions)
+            for key in keys:
+                with self.subTest(partitions=partitions, key=key):
+                    self.assertEqual(len(find_partitions(bounds, key)), 1)
+
+    def test_invalid_partitions(self) -> None:
+        """Test that counts outside 1-256 raise ValueError."""
+        for partitions in (0, -1, 257):
+            with self.subTest(partitions=partitions):
+                with self.assertRaises(ValueError):
+                    partition_bounds(partitions)
+
+
+if __name__ == '__main__':
+    unittest.main()
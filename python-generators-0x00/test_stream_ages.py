@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""Unit tests for the streaming age statistics in 4-stream_ages."""
+
+import random
+import statistics
+import unittest
+
+stream_ages = __import__('4-stream_ages')
+AgeAccumulator = stream_ages.AgeAccumulator
+
+
+class TestAgeAccumulator(unittest.TestCase):
+    """Test cases for merging batches in AgeAccumulator."""
+
+    def test_batches_match_whole_population(self) -> None:
+        """Test that merging uneven batches gives the statistics of all values at once."""
+        generator = random.Random(42)
+        ages = [generator.randint(18, 90) for _ in range(1000)]
+        accumulator = AgeAccumulator()
+        start = 0
+        for size in (1, 7, 0, 250, 500, 242):
+            accumulator.add_batch(ages[start:start + size])
+            start += size
+
+        result = accumulator.result()
+        self.assertEqual(result['count'], len(ages))
+        self.assertAlmostEqual(result['avg'], statistics.fmean(ages))
+        self.assertAlmostEqual(result['variance'], statistics.pvariance(ages))
+        self.assertAlmostEqual(result['stddev'], statistics.pstdev(ages))
+        self.assertEqual(result['min'], min(ages))
+        self.assertEqual(result['max'], max(ages))
+
+    def test_single_value(self) -> None:
+        """Test that a single value has zero variance."""
+        accumulator = AgeAccumulator()
+        accumulator.add_batch([30])
+        result = accumulator.result()
+        self.assertEqual((result['count'], result['avg'], result['variance']), (1, 30.0, 0.0))
+
+    def test_empty(self) -> None:
+        """Test that no values give zeroes and no percentiles."""
+        result = AgeAccumulator().result(percentiles=(50,), bin_width=10)
+        self.assertEqual(result['count'], 0)
+        self.assertEqual(result['avg'], 0.0)
+        self.assertIsNone(result['min'])
+        self.assertEqual(result['percentiles'], {50: None})
+        self.assertEqual(result['histogram'], {})
+
+
+class TestPercentilesAndHistogram(unittest.TestCase):
+    """Test cases for percentiles and histograms from the exact value counts."""
+
+    def setUp(self) -> None:
+        """Accumulate the ages 1 to 100 in two batches."""
+        self.accumulator = AgeAccumulator()
+        self.accumulator.add_batch(list(range(1, 51)))
+        self.accumulator.add_batch(list(range(51, 101)))
+
+    def test_nearest_rank_percentiles(self) -> None:
+        """Test that percentiles use the nearest-rank method."""
+        result = self.accumulator.result(percentiles=(0, 1, 50, 90, 99.5, 100))
+        self.assertEqual(result['percentiles'], {0: 1, 1: 1, 50: 50, 90: 90, 99.5: 100, 100: 100})
+
+    def test_percentiles_with_repeated_values(self) -> None:
+        """Test that repeated values are counted by rank, not by distinct value."""
+        accumulator = AgeAccumulator()
+        accumulator.add_batch([20] * 9 + [80])
+        self.assertEqual(accumulator.result(percentiles=(90, 91))['percentiles'], {90: 20, 91: 80})
+
+    def test_percentile_out_of_range(self) -> None:
+        """Test that percentiles outside 0-100 raise ValueError."""
+        with self.assertRaises(ValueError):
+            self.accumulator.result(percentiles=(101,))
+
+    def test_histogram(self) -> None:
+        """Test that the histogram buckets counts by bin_width."""
+        histogram = self.accumulator.result(bin_width=25)['histogram']
+        self.assertEqual(histogram, {0: 24, 25: 25, 50: 25, 75: 25, 100: 1})
+
+
+if __name__ == '__main__':
+    unittest.main()